@@ -0,0 +1,218 @@
+r"""Запросы в секунду к страницам для чтения: WSGI против ASGI.
+
+Проект по очереди запускается под gunicorn двумя способами: WSGI —
+синхронные представления в воркерах `gthread`, ASGI — `blog.async_views`
+в воркерах uvicorn (`uvicorn.workers.UvicornWorker`). Число воркеров у
+обоих одинаковое. Нагрузку по HTTP создают отдельные процессы:
+`--concurrency` постоянных соединений на заранее заполненной базе
+(`manage.py seed_blog`). Страницы открывает вошедший пользователь,
+чтобы не мерить кэш страниц для анонимов.
+
+    python benchmarks/async_views.py --database bench.sqlite3 \
+        --concurrency 64 --workers 4 --duration 10
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from common import ROOT, setup_django
+
+SERVERS = {
+    'wsgi': ['blogicum.wsgi:application', '--worker-class', 'gthread'],
+    'asgi': ['blogicum.asgi:application',
+             '--worker-class', 'uvicorn.workers.UvicornWorker'],
+}
+
+
+def sample_urls(sample_size):
+    from blog.models import Category, Post
+
+    posts = list(Post.objects.published().order_by('?')
+                 .values_list('pk', 'author__username')[:sample_size])
+    if not posts:
+        raise SystemExit('В базе нет опубликованных постов: '
+                         'сначала выполните manage.py seed_blog.')
+    categories = Category.objects.filter(is_published=True).values_list(
+        'slug', flat=True)
+    return [
+        '/',
+        '/?page=2',
+        *(f'/posts/{pk}/' for pk, _ in posts),
+        *(f'/profile/{username}/' for _, username in posts),
+        *(f'/category/{slug}/' for slug in categories),
+    ]
+
+
+def session_cookie():
+    """Cookie сессии пользователя для запросов к серверу."""
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+
+    user, _ = get_user_model().objects.get_or_create(username='bench_user')
+    client = Client()
+    client.force_login(user)
+    name = settings.SESSION_COOKIE_NAME
+    return f'{name}={client.cookies[name].value}'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, args, port):
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'server_settings',
+        'DATABASE_URL': f'sqlite:///{Path(args.database).resolve()}',
+        'PYTHONPATH': os.pathsep.join([str(ROOT / 'benchmarks'),
+                                       str(ROOT / 'blogicum')]),
+    }
+    env.pop('ASYNC_VIEWS', None)
+    return subprocess.Popen([
+        sys.executable, '-m', 'gunicorn', *SERVERS[mode],
+        '--workers', str(args.workers), '--threads', str(args.threads),
+        '--bind', f'127.0.0.1:{port}', '--log-level', 'warning',
+    ], cwd=ROOT / 'blogicum', env=env)
+
+
+def wait_ready(port, server, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit('Сервер завершился при запуске.')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port)
+            connection.request('GET', '/')
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit('Сервер не ответил за отведённое время.')
+
+
+def load(port, urls, cookie, connections, duration, seed, results):
+    """Держит `connections` соединений, пока не выйдет `duration`."""
+    latencies, errors = [], []
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                connection.request('GET', rng.choice(urls),
+                                   headers={'Cookie': cookie})
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                errors.append(1)
+                connection.close()
+                continue
+            if response.status >= 500:
+                errors.append(1)
+            latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=worker, args=(index,))
+               for index in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put((latencies, len(errors)))
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(share * (len(ordered) - 1)))]
+
+
+def measure(mode, args, urls, cookie):
+    port = free_port()
+    server = start_server(mode, args, port)
+    try:
+        wait_ready(port, server)
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        clients = min(args.clients, args.concurrency)
+        shares = [args.concurrency // clients
+                  + (index < args.concurrency % clients)
+                  for index in range(clients)]
+        processes = [
+            context.Process(target=load, args=(
+                port, urls, cookie, share, args.duration,
+                args.seed + index, results,
+            ))
+            for index, share in enumerate(shares)
+        ]
+        for process in processes:
+            process.start()
+        latencies, errors = [], 0
+        for _ in processes:
+            process_latencies, process_errors = results.get()
+            latencies += process_latencies
+            errors += process_errors
+        for process in processes:
+            process.join()
+    finally:
+        server.terminate()
+        server.wait()
+    if not latencies:
+        raise SystemExit(f'{mode}: ни один запрос не выполнен.')
+    return {
+        'requests_per_second': len(latencies) / args.duration,
+        'errors': errors,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', required=True,
+                        help='Путь к файлу SQLite.')
+    parser.add_argument('--concurrency', type=int, default=64,
+                        help='Одновременных соединений с сервером.')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Процессов сервера в обоих режимах.')
+    parser.add_argument('--threads', type=int, default=8,
+                        help='Потоков в каждом WSGI-воркере.')
+    parser.add_argument('--clients', type=int,
+                        default=max(os.cpu_count() // 2, 1),
+                        help='Процессов, создающих нагрузку.')
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--sample', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='async_views.json')
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    random.seed(args.seed)
+    urls = sample_urls(args.sample)
+    cookie = session_cookie()
+
+    report = {'concurrency': args.concurrency, 'workers': args.workers,
+              'threads': args.threads}
+    for mode in SERVERS:
+        report[mode] = measure(mode, args, urls, cookie)
+        print(f"{mode}: {report[mode]['requests_per_second']:8.1f} req/s"
+              f"  p50={report[mode]['p50_ms']:7.1f}ms"
+              f"  p99={report[mode]['p99_ms']:7.1f}ms"
+              f"  errors={report[mode]['errors']}")
+    Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
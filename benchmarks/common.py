@@ -0,0 +1,24 @@
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+
+def setup_django(database=None, **overrides):
+    """Настраивает Django для замеров: своя база, без отладки."""
+    import django
+    from blogicum import settings as project_settings
+
+    if database:
+        project_settings.DATABASES['default']['NAME'] = database
+    project_settings.DEBUG = False
+    project_settings.QUERY_INSTRUMENTATION = False
+    for name, value in overrides.items():
+        setattr(project_settings, name, value)
+    django.setup()
+
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
@@ -0,0 +1,204 @@
+"""Замеры производительности страниц блога.
+
+Запуск из корня репозитория на заранее заполненной базе
+(`manage.py seed_blog`):
+
+    python benchmarks/run.py --database bench.sqlite3 --output before.json
+    python benchmarks/run.py compare before.json after.json
+
+Для каждого сценария сохраняются перцентили задержки, число
+SQL-запросов и пиковая память Python (tracemalloc).
+"""
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+
+from common import ROOT, setup_django
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(share * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def build_scenarios(sample_size):
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+
+    from blog.models import Category, Post
+
+    User = get_user_model()
+    posts = list(Post.objects.published().order_by('?')
+                 .values_list('pk', 'author__username')[:sample_size])
+    if not posts:
+        raise SystemExit('В базе нет опубликованных постов: '
+                         'сначала выполните manage.py seed_blog.')
+    categories = list(Category.objects.filter(is_published=True)
+                      .values_list('slug', flat=True))
+    admin, _ = User.objects.get_or_create(
+        username='bench_admin',
+        defaults={'is_staff': True, 'is_superuser': True},
+    )
+    anonymous = Client()
+    logged_in = Client()
+    logged_in.force_login(admin)
+
+    def get(client, url):
+        return lambda: client.get(url())
+
+    return {
+        'index': get(anonymous, lambda: '/'),
+        'index_deep_page': get(anonymous, lambda: '/?page=50'),
+        'category_posts': get(
+            anonymous,
+            lambda: f'/category/{random.choice(categories)}/',
+        ),
+        'profile': get(
+            anonymous,
+            lambda: f'/profile/{random.choice(posts)[1]}/',
+        ),
+        'post_detail': get(
+            logged_in,
+            lambda: f'/posts/{random.choice(posts)[0]}/',
+        ),
+        'add_comment': lambda: logged_in.post(
+            f'/posts/{random.choice(posts)[0]}/comment/',
+            {'text': 'Комментарий для замера'},
+        ),
+        'admin_post_changelist': get(logged_in, lambda: '/admin/blog/post/'),
+        'admin_comment_changelist': get(
+            logged_in, lambda: '/admin/blog/comment/'
+        ),
+        'admin_category_changelist': get(
+            logged_in, lambda: '/admin/blog/category/'
+        ),
+        'admin_location_changelist': get(
+            logged_in, lambda: '/admin/blog/location/'
+        ),
+    }
+
+
+def measure(request, iterations, warmup, cold):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    for _ in range(warmup):
+        request()
+    latencies, query_counts, statuses = [], [], set()
+    for _ in range(iterations):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = request()
+            latencies.append((time.perf_counter() - start) * 1000)
+        query_counts.append(len(queries))
+        statuses.add(response.status_code)
+    # tracemalloc заметно замедляет код, поэтому память — отдельным проходом.
+    if cold:
+        cache.clear()
+    tracemalloc.start()
+    request()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'iterations': iterations,
+        'statuses': sorted(statuses),
+        'latency_ms': {
+            'mean': statistics.mean(latencies),
+            'p50': percentile(latencies, 0.5),
+            'p90': percentile(latencies, 0.9),
+            'p99': percentile(latencies, 0.99),
+            'max': max(latencies),
+        },
+        'queries': {
+            'mean': statistics.mean(query_counts),
+            'max': max(query_counts),
+        },
+        'peak_memory_kb': peak / 1024,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    setup_django(args.database)
+    from django.db import connection
+
+    random.seed(args.seed)
+    scenarios = build_scenarios(args.sample)
+    selected = args.scenario or list(scenarios)
+    results = {
+        'revision': git_revision(),
+        'database': str(connection.settings_dict['NAME']),
+        'cold_cache': args.cold,
+        'scenarios': {},
+    }
+    for name in selected:
+        result = measure(scenarios[name], args.iterations, args.warmup,
+                         args.cold)
+        results['scenarios'][name] = result
+        latency = result['latency_ms']
+        print(f'{name:28} p50={latency["p50"]:8.2f}ms '
+              f'p99={latency["p99"]:8.2f}ms '
+              f'queries={result["queries"]["max"]:3} '
+              f'peak={result["peak_memory_kb"]:9.1f}KiB')
+    Path(args.output).write_text(
+        json.dumps(results, indent=2, ensure_ascii=False)
+    )
+
+
+def compare(args):
+    old = json.loads(Path(args.old).read_text())['scenarios']
+    new = json.loads(Path(args.new).read_text())['scenarios']
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name], new[name]
+        change = (after['latency_ms']['p50'] / before['latency_ms']['p50']
+                  - 1) * 100
+        print(f'{name:28} p50 {before["latency_ms"]["p50"]:8.2f} -> '
+              f'{after["latency_ms"]["p50"]:8.2f}ms ({change:+6.1f}%) '
+              f'queries {before["queries"]["max"]} -> '
+              f'{after["queries"]["max"]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command')
+    compare_parser = subparsers.add_parser('compare')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    parser.add_argument('--database', help='Путь к файлу SQLite.')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--sample', type=int, default=100,
+                        help='Сколько случайных постов брать в сценарии.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cold', action='store_true',
+                        help='Очищать кэш перед каждым запросом.')
+    parser.add_argument('--scenario', action='append',
+                        help='Запустить только этот сценарий.')
+    args = parser.parse_args()
+    if args.command == 'compare':
+        compare(args)
+    else:
+        run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+"""Настройки серверов, которые запускает benchmarks/async_views.py.
+
+Как в продакшене: без отладки и учёта запросов. База задаётся через
+`DATABASE_URL`.
+"""
+from blogicum.settings import *  # noqa: F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ['127.0.0.1', 'localhost']
+QUERY_INSTRUMENTATION = False
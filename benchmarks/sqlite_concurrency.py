@@ -0,0 +1,111 @@
+"""Пропускная способность SQLite при одновременных чтении и записи.
+
+Сравнивает настройки SQLite по умолчанию с `SQLITE_PRAGMAS` из
+настроек проекта: несколько процессов читают ленту, несколько пишут
+комментарии. Для каждой базы создаётся временный файл.
+
+    python benchmarks/sqlite_concurrency.py --readers 8 --writers 2
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from common import setup_django
+
+
+def prepare(database, pragmas, posts):
+    setup_django(database, SQLITE_PRAGMAS=pragmas)
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    call_command('seed_blog', users=50, posts=posts, comments=posts * 5,
+                 verbosity=0, stdout=open(Path(database).parent / 'seed.log',
+                                          'w'))
+
+
+def work(role, database, pragmas, duration, results):
+    setup_django(database, SQLITE_PRAGMAS=pragmas)
+    from django.db import OperationalError, transaction
+    from django.db.models import F
+
+    from blog.models import Comment, Post, User
+    from blog.querysets import displayed_posts, limited_access_posts
+
+    post_ids = list(Post.objects.values_list('pk', flat=True)[:1000])
+    user_id = User.objects.values_list('pk', flat=True).first()
+    done = locked = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        try:
+            if role == 'reader':
+                list(displayed_posts(limited_access_posts())[:10])
+            else:
+                post_id = random.choice(post_ids)
+                with transaction.atomic():
+                    Comment.objects.create(text='Нагрузка', post_id=post_id,
+                                           author_id=user_id)
+                    Post.objects.filter(pk=post_id).update(
+                        comment_count=F('comment_count') + 1)
+            done += 1
+        except OperationalError:
+            locked += 1
+    results.put((role, done, locked))
+
+
+def run_mode(name, pragmas, args, context):
+    with tempfile.TemporaryDirectory() as directory:
+        database = str(Path(directory) / f'{name}.sqlite3')
+        process = context.Process(target=prepare,
+                                  args=(database, pragmas, args.posts))
+        process.start()
+        process.join()
+        results = context.Queue()
+        roles = ['reader'] * args.readers + ['writer'] * args.writers
+        workers = [
+            context.Process(target=work, args=(role, database, pragmas,
+                                               args.duration, results))
+            for role in roles
+        ]
+        for worker in workers:
+            worker.start()
+        totals = {'reader': [0, 0], 'writer': [0, 0]}
+        for _ in workers:
+            role, done, locked = results.get()
+            totals[role][0] += done
+            totals[role][1] += locked
+        for worker in workers:
+            worker.join()
+    return {
+        'reads_per_second': totals['reader'][0] / args.duration,
+        'writes_per_second': totals['writer'][0] / args.duration,
+        'locked_errors': totals['reader'][1] + totals['writer'][1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--output', default='sqlite_concurrency.json')
+    args = parser.parse_args()
+
+    from blogicum.settings import SQLITE_PRAGMAS
+
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    for name, pragmas in (('default', {}), ('tuned', SQLITE_PRAGMAS)):
+        results[name] = result = run_mode(name, pragmas, args, context)
+        print(f'{name:8} reads/s={result["reads_per_second"]:9.1f} '
+              f'writes/s={result["writes_per_second"]:8.1f} '
+              f'locked={result["locked_errors"]}')
+    Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
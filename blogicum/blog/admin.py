@@ -1,18 +1,121 @@
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.db.models import Q
+from django.db.models.functions import Substr
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
 
-from .models import Category, Comment, Location, Post
+from .lookups import attach_lookups, categories, locations
+from .models import Category, Comment, Location, Post, User
+from .paginators import EstimatedCountPaginator
+from .search import comment_index, post_index, search_terms
 
+TEXT_PREVIEW_LENGTH = 80
+RECENT_POSTS_COUNT = 10
 
-class PostInline(admin.StackedInline):
-    model = Post
-    extra = 0
 
+class LookupAutocompleteSelect(AutocompleteSelect):
+    """Автодополнение, которое выбранную запись берёт из справочника.
 
-class CategoryAdmin(admin.ModelAdmin):
-    inlines = (
-        PostInline,
-    )
+    Стандартный виджет читает выбранную запись из БД — в списке с
+    `list_editable` это запрос на каждую строку. Остальные варианты
+    подгружаются по мере ввода, а не выводятся в каждой строке.
+    """
+
+    def __init__(self, field, admin_site, table, **kwargs):
+        super().__init__(field, admin_site, **kwargs)
+        self.table = table
+
+    def optgroups(self, name, value, attr=None):
+        rows = [self.table.get(int(pk)) for pk in value
+                if str(pk).isdigit()]
+        if None in rows:
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        for row in rows:
+            options.append(self.create_option(
+                name, row.pk, self.choices.field.label_from_instance(row),
+                True, len(options),
+            ))
+        return [(None, options, 0)]
+
+
+class PreviewChangeList(ChangeList):
+    """Список, в котором длинный текст читается из БД только началом.
+
+    Поля из `changelist_defer` модели-администратора не загружаются,
+    а строки страницы перед выводом проходят через её `prepare_results`.
+    """
+
+    def get_queryset(self, request):
+        return (super().get_queryset(request)
+                .annotate(text_preview=Substr('text', 1,
+                                              TEXT_PREVIEW_LENGTH))
+                .defer(*self.model_admin.changelist_defer))
+
+    def get_results(self, request):
+        super().get_results(request)
+        self.model_admin.prepare_results(self.result_list)
+
+
+class PreviewAdminMixin:
+    """Начало текста вместо полного текста и оценка числа строк."""
+
+    changelist_defer = ('text',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return PreviewChangeList
+
+    def prepare_results(self, results):
+        pass
+
+    @admin.display(description='Текст')
+    def text_preview(self, obj):
+        preview = obj.text_preview
+        if len(preview) == TEXT_PREVIEW_LENGTH:
+            preview += '…'
+        return preview
+
+
+class PostsSummaryMixin:
+    """Сводка по постам объекта вместо формы на каждый пост.
+
+    Страница категории или локации показывает число постов, последние
+    `RECENT_POSTS_COUNT` из них и ссылку на список постов с фильтром —
+    за два запроса при любом числе постов. `posts_field` — поле `Post`,
+    которое ссылается на объект.
+    """
+
+    posts_field = None
+    readonly_fields = ('posts_summary',)
+
+    @admin.display(description='Публикации')
+    def posts_summary(self, obj):
+        if obj.pk is None:
+            return '—'
+        posts = Post.objects.filter(**{self.posts_field: obj.pk})
+        recent = (posts.order_by('-pub_date', '-id')
+                  .values_list('pk', 'title')[:RECENT_POSTS_COUNT])
+        changelist_url = reverse('admin:blog_post_changelist')
+        items = format_html_join('', '<li><a href="{}">{}</a></li>', (
+            (reverse('admin:blog_post_change', args=[pk]), title)
+            for pk, title in recent
+        ))
+        return format_html(
+            '<p>Всего: {} — <a href="{}?{}__id__exact={}">все публикации'
+            '</a></p><ul>{}</ul>',
+            posts.count(), changelist_url, self.posts_field, obj.pk, items,
+        )
+
+
+class CategoryAdmin(PostsSummaryMixin, admin.ModelAdmin):
+    posts_field = 'category'
     list_display = (
         'title',
         'description',
@@ -25,10 +128,8 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ('title',)
 
 
-class LocationAdmin(admin.ModelAdmin):
-    inlines = (
-        PostInline,
-    )
+class LocationAdmin(PostsSummaryMixin, admin.ModelAdmin):
+    posts_field = 'location'
     list_display = (
         'name',
         'is_published',
@@ -39,10 +140,10 @@ class LocationAdmin(admin.ModelAdmin):
     search_fields = ('name',)
 
 
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(PreviewAdminMixin, admin.ModelAdmin):
     list_display = (
         'title',
-        'text',
+        'text_preview',
         'pub_date',
         'author',
         'location',
@@ -54,20 +155,66 @@ class PostAdmin(admin.ModelAdmin):
         'category',
         'location',
         'is_published',)
-    search_fields = ('title',)
+    list_select_related = ('author',)
+    list_filter = ('category', 'location', 'is_published')
+    autocomplete_fields = ('author', 'category', 'location')
+    search_fields = ('title', 'text')
     list_display_links = ('title',)
 
+    def prepare_results(self, results):
+        attach_lookups(results)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        """Категории и локации — из справочников, без запроса на строку."""
+        table = {'category': categories,
+                 'location': locations}.get(db_field.name)
+        if table is not None and 'widget' not in kwargs:
+            kwargs['widget'] = LookupAutocompleteSelect(
+                db_field, self.admin_site, table, using=kwargs.get('using'),
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_search_results(self, request, queryset, search_term):
+        """Ищет по полнотекстовому индексу, а не `LIKE '%слово%'`."""
+        if not post_index.available(queryset.db):
+            return super().get_search_results(request, queryset, search_term)
+        return post_index.filter(queryset, search_term), False
 
-class CommentAdmin(admin.ModelAdmin):
+
+class CommentAdmin(PreviewAdminMixin, admin.ModelAdmin):
+    changelist_defer = ('text', 'post__text', 'post__image_variants')
     list_display = (
-        'text',
+        'text_preview',
         'created_at',
         'author',
         'post'
     )
-    search_fields = ('author', 'post', )
+    list_select_related = ('author', 'post')
+    autocomplete_fields = ('author', 'post')
+    date_hierarchy = 'created_at'
+    search_fields = ('=author__username', '^post__title', 'text')
     list_display_links = ('author', 'post',)
 
+    def get_search_results(self, request, queryset, search_term):
+        """Поиск по имени автора, началу заголовка поста и тексту.
+
+        Имя сравнивается точно, заголовок — диапазоном по индексу,
+        текст ищется по полнотекстовому индексу: каждое условие —
+        подзапрос по своему индексу, а не `LIKE` по соединённым таблицам.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        authors = User.objects.filter(username=term).values('pk')
+        posts = Post.objects.filter(
+            title__gte=term, title__lt=term + '\U0010ffff'
+        ).values('pk')
+        condition = Q(author__in=authors) | Q(post__in=posts)
+        terms = search_terms(term)
+        if terms:
+            condition |= comment_index.condition(terms, queryset.db)
+        return queryset.filter(condition), False
+
 
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Post, PostAdmin)
@@ -0,0 +1,148 @@
+"""Асинхронные версии страниц, которые только читают данные.
+
+Подключаются вместо синхронных при `ASYNC_VIEWS` — по умолчанию под
+ASGI (blogicum/asgi.py). Независимые запросы страницы — пост и его
+комментарии, автор и страница его постов, категория и страница её
+постов, строки страницы и их общее число — выполняются одновременно
+в пуле потоков.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.core.paginator import Page, Paginator
+from django.db import close_old_connections
+from django.http import Http404
+from django.shortcuts import get_object_or_404, render
+
+from .cards import attach_cards
+from .conditions import (category_state, conditional, feed_count,
+                         feed_state, post_state, profile_state)
+from .forms import CommentForm
+from .lookups import attach_lookups, categories
+from .models import Post
+from .querysets import (displayed_posts, feed_now, get_paginate,
+                        limited_access_posts, load_cached_page,
+                        store_cached_page, uses_cursor)
+from .views import comments_paginator, get_profile
+from core.canstants import POST_COUNT
+from core.page_cache import cache_anonymous_page
+
+
+def in_thread(func):
+    """Синхронная функция как корутина.
+
+    При `ASYNC_VIEWS_PARALLEL_DB` каждый вызов идёт в свой поток со
+    своим соединением с БД, и вызовы одной страницы не ждут друг
+    друга. Иначе все они выполняются по очереди в общем потоке.
+    """
+    if not settings.ASYNC_VIEWS_PARALLEL_DB:
+        return sync_to_async(func)
+
+    def run(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(run, thread_sensitive=False)
+
+
+def page_number(request):
+    try:
+        return max(int(request.GET.get('page') or 1), 1)
+    except ValueError:
+        return 1
+
+
+async def get_page(post_list, request, count=None):
+    """Как `get_paginate`, но строки и их число читаются одновременно."""
+    if uses_cursor(request):
+        return await in_thread(get_paginate)(post_list, request)
+    paginator = Paginator(post_list, POST_COUNT)
+    page_param = f'page={request.GET.get("page")}'
+    page_obj = await in_thread(load_cached_page)(
+        paginator, post_list, page_param
+    )
+    if page_obj is not None:
+        return page_obj
+    number = page_number(request)
+    bottom = (number - 1) * POST_COUNT
+    rows = in_thread(list)(post_list[bottom:bottom + POST_COUNT])
+    if count is None:
+        rows, count = await asyncio.gather(rows, in_thread(post_list.count)())
+    else:
+        rows = await rows
+    paginator.count = count
+    if number > paginator.num_pages:
+        page_obj = await in_thread(paginator.get_page)(number)
+    else:
+        page_obj = Page(rows, number, paginator)
+    return await in_thread(store_cached_page)(page_obj, post_list, page_param)
+
+
+def render_feed(request, template_name, context):
+    attach_cards(context['page_obj'])
+    return render(request, template_name, context)
+
+
+@cache_anonymous_page('index')
+@conditional(feed_state)
+async def index(request):
+    post_list = displayed_posts(limited_access_posts(feed_now()))
+    page_obj = await get_page(post_list, request, feed_count(request))
+    return await in_thread(render_feed)(
+        request, 'blog/index.html', {'page_obj': page_obj}
+    )
+
+
+@cache_anonymous_page('category:{category_slug}')
+@conditional(category_state)
+async def category_post(request, category_slug):
+    post_list = (displayed_posts(limited_access_posts(feed_now()))
+                 .filter(category__slug=category_slug))
+    category, page_obj = await asyncio.gather(
+        in_thread(categories.get_by_slug)(category_slug),
+        get_page(post_list, request, feed_count(request)),
+    )
+    if category is None or not category.is_published:
+        raise Http404('Категория не найдена.')
+    return await in_thread(render_feed)(
+        request, 'blog/category.html',
+        {'page_obj': page_obj, 'category': category_slug},
+    )
+
+
+@conditional(profile_state)
+async def profile(request, username):
+    post_list = displayed_posts().filter(author__username=username)
+    (user, stats), page_obj = await asyncio.gather(
+        in_thread(get_profile)(request, username),
+        get_page(post_list, request, feed_count(request)),
+    )
+    return await in_thread(render_feed)(request, 'blog/profile.html', {
+        'profile': user,
+        'stats': stats,
+        'page_obj': page_obj,
+    })
+
+
+@conditional(post_state)
+async def post_detail(request, post_id):
+    if not await in_thread(lambda: request.user.is_authenticated)():
+        return redirect_to_login(request.get_full_path())
+    posts = displayed_posts(Post.objects.visible_to(request.user))
+    post, comments = await asyncio.gather(
+        in_thread(get_object_or_404)(posts, pk=post_id),
+        in_thread(comments_paginator(post_id).get_page)(
+            request.GET.get('comment_cursor')
+        ),
+    )
+    await in_thread(attach_lookups)([post])
+    return await in_thread(render)(request, 'blog/detail.html', {
+        'post': post,
+        'object': post,
+        'form': CommentForm(),
+        'comments': comments,
+    })
@@ -0,0 +1,32 @@
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .lookups import attach_lookups
+from core.canstants import POST_CARD_CACHE_TIMEOUT
+
+CARD_TEMPLATE = 'includes/post_card.html'
+
+
+def card_key(post):
+    return f'post_card:{post.pk}:{post.updated_at.timestamp()}'
+
+
+def attach_cards(posts):
+    """Кладёт в `post.card` готовую карточку каждого поста страницы.
+
+    Все карточки берутся из кэша за одно обращение, недостающие
+    рендерятся и сохраняются одним `set_many`.
+    """
+    posts = {card_key(post): post for post in posts}
+    cards = cache.get_many(posts)
+    missing = {}
+    attach_lookups(post for key, post in posts.items() if key not in cards)
+    for key, post in posts.items():
+        if key not in cards:
+            cards[key] = missing[key] = render_to_string(
+                CARD_TEMPLATE, {'post': post}
+            )
+        post.card = mark_safe(cards[key])
+    if missing:
+        cache.set_many(missing, POST_CARD_CACHE_TIMEOUT)
@@ -0,0 +1,204 @@
+"""ETag и Last-Modified для ленты и страницы поста.
+
+Состояние страницы читается одним агрегирующим запросом и
+используется для обоих заголовков. `Post.updated_at` меняется и при
+изменении категории, локации или комментариев поста (blog.signals),
+но у ленты его максимума мало: удалённый, снятый с публикации или
+перенесённый в другую категорию пост и наступивший отложенный его не
+трогают. Поэтому ETag ленты учитывает ещё поколение лент и самую
+позднюю дату публикации, а Last-Modified у лент не отдаётся — иначе
+клиент с одним `If-Modified-Since` получал бы 304 на устаревшую ленту.
+"""
+import asyncio
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+
+from .models import Category, Post, User
+from .querysets import (FEED_GENERATION_KEY, feed_now,
+                        limited_access_posts)
+
+
+def conditional(get_state):
+    """`condition()`, у которого ETag и Last-Modified берутся из
+    `get_state(request, *args, **kwargs)`.
+
+    Функция возвращает словарь с ключом `last_modified` или None,
+    если страницы нет и представление должно ответить само.
+    Асинхронное представление получает те же заголовки, а состояние
+    читается в потоке.
+    """
+    def state(request, *args, **kwargs):
+        if not hasattr(request, '_conditional_state'):
+            request._conditional_state = get_state(request, *args, **kwargs)
+        return request._conditional_state
+
+    def etag(request, *args, **kwargs):
+        page_state = state(request, *args, **kwargs)
+        if page_state is None:
+            return None
+        raw = '|'.join(map(str, [*page_state.values(), request.user.pk,
+                                 request.GET.urlencode()]))
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        page_state = state(request, *args, **kwargs)
+        return page_state and page_state['last_modified']
+
+    def validators(request, *args, **kwargs):
+        value = etag(request, *args, **kwargs)
+        modified = last_modified(request, *args, **kwargs)
+        return (value and quote_etag(value),
+                modified and timegm(modified.utctimetuple()))
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            return async_condition(view, validators)
+        return condition(etag_func=etag,
+                         last_modified_func=last_modified)(view)
+
+    return decorator
+
+
+def async_condition(view, validators):
+    """`condition()` для асинхронного представления.
+
+    `validators(request, *args, **kwargs)` возвращает готовые ETag и
+    Last-Modified (секунды); они считаются в потоке.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        res_etag, res_last_modified = await sync_to_async(validators)(
+            request, *args, **kwargs
+        )
+        response = get_conditional_response(
+            request, etag=res_etag, last_modified=res_last_modified
+        )
+        if response is not None:
+            return response
+        response = await view(request, *args, **kwargs)
+        if request.method in ('GET', 'HEAD'):
+            if res_last_modified and not response.has_header(
+                    'Last-Modified'):
+                response['Last-Modified'] = http_date(res_last_modified)
+            if res_etag and not response.has_header('ETag'):
+                response['ETag'] = res_etag
+        return response
+    return wrapper
+
+
+def cached_state(get_state):
+    """Кэширует состояние до смены поколения лент или интервала времени.
+
+    Поколение меняется при любом изменении постов, категорий, локаций
+    и комментариев, так что повторный запрос обходится без БД.
+    """
+    @wraps(get_state)
+    def wrapper(request, *args, **kwargs):
+        raw = '|'.join(map(str, [
+            get_state.__name__, args, sorted(kwargs.items()),
+            request.user.pk, cache.get(FEED_GENERATION_KEY, 0),
+            feed_now().timestamp(),
+        ]))
+        key = 'page_state:' + hashlib.md5(raw.encode()).hexdigest()
+        state = cache.get(key)
+        if state is None:
+            state = get_state(request, *args, **kwargs)
+            cache.set(key, state, settings.FEED_TIME_BUCKET)
+        return state
+    return wrapper
+
+
+def page_state(request):
+    """Состояние, уже прочитанное для заголовков этого запроса."""
+    return getattr(request, '_conditional_state', None)
+
+
+def feed_count(request):
+    """Число постов ленты из состояния страницы, если оно известно."""
+    state = page_state(request)
+    return state and state['count']
+
+
+def feed_generation_state(state):
+    """Дополняет состояние ленты поколением лент.
+
+    Поколение меняется при удалении и любом изменении поста, так что
+    ETag не совпадёт с прежним, даже если число постов и даты те же.
+    """
+    if state is not None:
+        state['generation'] = cache.get(FEED_GENERATION_KEY, 0)
+        state['last_modified'] = None
+    return state
+
+
+@cached_state
+def feed_state(request):
+    return feed_generation_state(limited_access_posts(feed_now()).aggregate(
+        updated_at=Max('updated_at'), latest=Max('pub_date'),
+        count=Count('pk'),
+    ))
+
+
+@cached_state
+def category_state(request, category_slug):
+    published = Q(category_posts__pub_date__lte=feed_now(),
+                  category_posts__is_visible=True)
+    return feed_generation_state(
+        Category.objects.filter(slug=category_slug, is_published=True)
+        .values('title', 'description')
+        .annotate(updated_at=Max('category_posts__updated_at',
+                                 filter=published),
+                  latest=Max('category_posts__pub_date', filter=published),
+                  count=Count('category_posts', filter=published))
+        .first()
+    )
+
+
+@cached_state
+def profile_state(request, username):
+    """Профиль и сводка автора — без подсчёта его постов.
+
+    Изменение любого поста меняет поколение лент, которое входит в
+    состояние; даты последнего изменения у профиля нет.
+    """
+    state = (User.objects.filter(username=username)
+             .values('first_name', 'last_name', 'is_staff',
+                     'stats__post_count', 'stats__published_count',
+                     'stats__comment_count', 'stats__last_post_at')
+             .first())
+    if state is not None:
+        state['count'] = state['stats__post_count'] or 0
+    return feed_generation_state(state)
+
+
+@cached_state
+def post_state(request, post_id):
+    """Состояние поста и его последнего комментария.
+
+    Анонимным посетителям страница поста недоступна — для них
+    заголовки не считаются, и представление отправит их на вход.
+    Отложенный пост, время которого наступило, до конца интервала
+    `FEED_TIME_BUCKET` отдаётся без заголовков — но не устаревшим.
+    """
+    if not request.user.is_authenticated:
+        return None
+    state = (Post.objects.visible_to(request.user).filter(pk=post_id)
+             .values('pub_date', 'updated_at', 'is_published',
+                     'is_visible', 'public_location')
+             .annotate(last_comment_at=Max('post__created_at'))
+             .first())
+    if state is not None:
+        state['last_modified'] = max(
+            state['updated_at'],
+            state['last_comment_at'] or state['updated_at'],
+        )
+    return state
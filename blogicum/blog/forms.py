@@ -1,9 +1,18 @@
 
 from django import forms
 
+from .lookups import categories, locations
 from .models import Comment, Post, User
 
 
+def lookup_choices(field, table):
+    """Варианты поля выбора из справочника `table` — без запроса к БД."""
+    return [
+        ('', field.empty_label),
+        *((row.pk, field.label_from_instance(row)) for row in table.all()),
+    ]
+
+
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
@@ -13,6 +22,22 @@ class PostForm(forms.ModelForm):
         }
         exclude = ('author',)
 
+    def __init__(self, *args, **kwargs):
+        """Варианты категорий и локаций — из справочников, без запросов."""
+        super().__init__(*args, **kwargs)
+        for name, table in (('category', categories),
+                            ('location', locations)):
+            field = self.fields[name]
+            field.choices = lookup_choices(field, table)
+
+
+class PostDeleteForm(forms.ModelForm):
+    """Подтверждение удаления: только экземпляр, без полей выбора."""
+
+    class Meta:
+        model = Post
+        fields = ()
+
 
 class UserForm(forms.ModelForm):
 
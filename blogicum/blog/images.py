@@ -0,0 +1,70 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+# Карточка и страница поста шириной 40rem: 1x и 2x для плотных экранов.
+DERIVATIVE_SIZES = {
+    'card': (640, 640),
+    'detail': (1280, 1280),
+}
+DERIVATIVE_DIR = 'post_images/derivatives'
+DERIVATIVE_QUALITY = 80
+
+
+def derivative_format():
+    if features.check('webp'):
+        return 'WEBP', 'webp'
+    return 'JPEG', 'jpg'
+
+
+def make_derivatives(name, storage=default_storage):
+    """Создаёт уменьшенные копии изображения `name` в хранилище.
+
+    Возвращает описание копий для `Post.image_variants`: имя исходника
+    и для каждого размера имя файла и его габариты.
+    """
+    image_format, extension = derivative_format()
+    with storage.open(name) as source:
+        image = ImageOps.exif_transpose(Image.open(source)).convert('RGB')
+    stem = PurePosixPath(name).stem
+    variants = {'source': name}
+    for size_name, size in DERIVATIVE_SIZES.items():
+        variant = image.copy()
+        variant.thumbnail(size, Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        variant.save(buffer, image_format, quality=DERIVATIVE_QUALITY,
+                     optimize=True, progressive=True)
+        path = storage.save(
+            f'{DERIVATIVE_DIR}/{stem}_{size_name}.{extension}',
+            ContentFile(buffer.getvalue()),
+        )
+        variants[size_name] = {
+            'name': path,
+            'width': variant.width,
+            'height': variant.height,
+        }
+    return variants
+
+
+def safe_make_derivatives(name):
+    """`make_derivatives`, не падающий на битых файлах."""
+    try:
+        return make_derivatives(name)
+    except (OSError, Image.DecompressionBombError):
+        return {'source': name}
+
+
+def refresh_image_variants(post):
+    """Пересоздаёт копии, если изображение поста сменилось."""
+    if 'image' in post.get_deferred_fields():
+        return
+    name = post.image.name or ''
+    if post.image_variants.get('source', '') == name:
+        return
+    post.image_variants = safe_make_derivatives(name) if name else {}
+    type(post).objects.filter(pk=post.pk).update(
+        image_variants=post.image_variants
+    )
@@ -0,0 +1,91 @@
+"""Справочники категорий и локаций в памяти процесса.
+
+Таблицы маленькие и меняются редко, поэтому целиком хранятся в кэше
+под ключом с версией и в памяти каждого процесса. Каждая выборка из
+справочника (`get`, `get_by_slug`, `attach_lookups` для целой
+страницы) читает версию из кэша один раз; сохранение или удаление
+записи перечитывает таблицу и меняет версию (blog.signals).
+
+Версия живёт `LOOKUP_VERSION_TIMEOUT` секунд, после чего таблица
+перечитывается из БД. С общим кэшем (memcached, Redis) изменение
+видно всем процессам сразу; с кэшем в памяти процесса
+(`LocMemCache`, по умолчанию) другие процессы увидят его не позже
+чем через этот интервал.
+"""
+import time
+
+from django.core.cache import cache
+
+from .models import Category, Location
+from core.canstants import LOOKUP_CACHE_TIMEOUT, LOOKUP_VERSION_TIMEOUT
+
+
+class LookupTable:
+    """Все строки модели по id и, если задано `slug_field`, по слагу."""
+
+    def __init__(self, model, slug_field=None):
+        self.model = model
+        self.slug_field = slug_field
+        self.version_key = f'lookup:{model._meta.label_lower}'
+        self._local = (None, {}, {})
+
+    def data_key(self, version):
+        return f'{self.version_key}:{version}'
+
+    def tables(self):
+        """Словари строк по id и по слагу — за одно чтение версии."""
+        version = cache.get(self.version_key)
+        local_version, by_id, by_slug = self._local
+        if version is not None and version == local_version:
+            return by_id, by_slug
+        rows = None if version is None else cache.get(self.data_key(version))
+        if rows is None:
+            version, rows = self.refresh()
+        by_id = {row.pk: row for row in rows}
+        by_slug = ({getattr(row, self.slug_field): row for row in rows}
+                   if self.slug_field else {})
+        self._local = (version, by_id, by_slug)
+        return by_id, by_slug
+
+    def refresh(self):
+        """Перечитывает таблицу из БД и публикует её под новой версией."""
+        rows = list(self.model.objects.order_by('pk'))
+        version = time.time_ns()
+        cache.set(self.data_key(version), rows, LOOKUP_CACHE_TIMEOUT)
+        cache.set(self.version_key, version, LOOKUP_VERSION_TIMEOUT)
+        return version, rows
+
+    def all(self):
+        return list(self.tables()[0].values())
+
+    def get(self, pk):
+        return self.tables()[0].get(pk)
+
+    def get_by_slug(self, slug):
+        return self.tables()[1].get(slug)
+
+
+categories = LookupTable(Category, slug_field='slug')
+locations = LookupTable(Location)
+
+
+def attach_lookups(posts):
+    """Подставляет постам категории и локации из справочников.
+
+    Ленты не соединяют эти таблицы в запросе: хватает `category_id`
+    и `location_id`. Записи, которой ещё нет в справочнике, пост
+    дочитает из БД сам.
+    """
+    posts = list(posts)
+    if not posts:
+        return posts
+    category_rows = categories.tables()[0]
+    location_rows = locations.tables()[0]
+    for post in posts:
+        category = category_rows.get(post.category_id)
+        if category is not None:
+            post.category = category
+        location = location_rows.get(post.location_id)
+        if location is not None:
+            post.location = location
+    return posts
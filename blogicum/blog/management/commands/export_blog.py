@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from blog.transfer import TransferJSONEncoder, export_objects
+
+
+class Command(BaseCommand):
+    help = ('Выгружает пользователей, категории, местоположения, посты и '
+            'комментарии в JSON/NDJSON, читая базу курсором.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--format',
+            choices=('json', 'ndjson'),
+            default='ndjson',
+        )
+
+    def handle(self, *args, **options):
+        as_array = options['format'] == 'json'
+        exported = 0
+        with open(options['path'], 'w', encoding='utf-8') as stream:
+            if as_array:
+                stream.write('[\n')
+            for data in export_objects(options['batch_size']):
+                if as_array and exported:
+                    stream.write(',\n')
+                stream.write(json.dumps(data, cls=TransferJSONEncoder,
+                                        ensure_ascii=False))
+                if not as_array:
+                    stream.write('\n')
+                exported += 1
+            if as_array:
+                stream.write('\n]\n')
+        self.stdout.write(
+            self.style.SUCCESS(f'Выгружено объектов: {exported}')
+        )
@@ -0,0 +1,74 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+from blog.images import safe_make_derivatives
+from blog.models import Post
+from blog.querysets import bump_feed_generation
+
+
+def derive(task):
+    pk, name = task
+    return pk, safe_make_derivatives(name)
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Число процессов для обработки изображений.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Сколько публикаций сохранять за один запрос.',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересоздать копии и там, где они уже есть.',
+        )
+
+    def handle(self, *args, **options):
+        posts = (Post.objects.exclude(image='')
+                 .only('image', 'image_variants').order_by('pk'))
+        tasks = [
+            (post.pk, post.image.name)
+            for post in posts.iterator()
+            if options['all']
+            or post.image_variants.get('source') != post.image.name
+        ]
+        if options['workers'] > 1:
+            connections.close_all()
+            with ProcessPoolExecutor(options['workers']) as pool:
+                processed = self.save(pool.map(derive, tasks, chunksize=8),
+                                      options['batch_size'])
+        else:
+            processed = self.save(map(derive, tasks), options['batch_size'])
+        bump_feed_generation()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано изображений: {processed}')
+        )
+
+    def save(self, results, batch_size):
+        batch, processed = [], 0
+        for pk, variants in results:
+            batch.append(Post(pk=pk, image_variants=variants,
+                              updated_at=timezone.now()))
+            if len(batch) >= batch_size:
+                processed += self.flush(batch)
+        return processed + self.flush(batch)
+
+    def flush(self, batch):
+        Post.objects.bulk_update(batch, ['image_variants', 'updated_at'])
+        flushed = len(batch)
+        batch.clear()
+        return flushed
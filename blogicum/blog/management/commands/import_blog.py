@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection
+
+from blog.lookups import categories, locations
+from blog.models import AuthorStats, Post
+from blog.querysets import bump_feed_generation
+from blog.transfer import BlogImporter, iter_json_objects
+
+
+class Command(BaseCommand):
+    help = ('Загружает пользователей, категории, местоположения, посты и '
+            'комментарии из JSON/NDJSON-файла пачками.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл в формате dumpdata или NDJSON.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--ignore-conflicts',
+            action='store_true',
+            help='Пропускать записи с уже существующими первичными ключами.',
+        )
+
+    def handle(self, *args, **options):
+        importer = BlogImporter(options['batch_size'],
+                                options['ignore_conflicts'])
+        with open(options['path'], encoding='utf-8') as stream:
+            for data in iter_json_objects(stream):
+                importer.add(data)
+        importer.finish()
+
+        models = [Post, Post.author.field.related_model,
+                  Post.category.field.related_model,
+                  Post.location.field.related_model,
+                  Post.post.rel.related_model]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+        Post.objects.recount_comments()
+        Post.objects.sync_visibility()
+        AuthorStats.objects.rebuild()
+        categories.refresh()
+        locations.refresh()
+        bump_feed_generation()
+
+        for label, created in importer.created.items():
+            self.stdout.write(f'{label}: загружено {created}')
+        for label, skipped in importer.skipped.items():
+            self.stdout.write(
+                self.style.WARNING(f'{label}: пропущено {skipped}')
+            )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog.search import comment_index, post_index
+
+
+class Command(BaseCommand):
+    help = 'Заново строит полнотекстовые индексы постов и комментариев.'
+
+    def handle(self, *args, **options):
+        for index in (post_index, comment_index):
+            if index.rebuild():
+                self.stdout.write(self.style.SUCCESS(
+                    f'Индекс {index.table} перестроен.'
+                ))
+            else:
+                self.stdout.write(
+                    f'Индекс {index.table} недоступен на этой БД.'
+                )
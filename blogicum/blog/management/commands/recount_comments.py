@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import AuthorStats, Post
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает счётчики комментариев у публикаций и сводки'
+            ' авторов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только показать число разошедшихся счётчиков.',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            stale = Post.objects.with_stale_comment_count().count()
+            self.stdout.write(f'Разошедшихся счётчиков: {stale}')
+            return
+        repaired = Post.objects.recount_comments()
+        authors = AuthorStats.objects.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {repaired}')
+        )
+        self.stdout.write(f'Пересчитано сводок авторов: {authors}')
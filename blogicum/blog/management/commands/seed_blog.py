@@ -0,0 +1,103 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from blog.lookups import categories, locations
+from blog.models import (AuthorStats, Category, Comment, Location, Post,
+                         User)
+from blog.querysets import bump_feed_generation
+
+WORDS = (
+    'утро', 'кофе', 'город', 'море', 'поезд', 'книга', 'дождь', 'друг',
+    'солнце', 'парк', 'вечер', 'дорога', 'музей', 'горы', 'снег', 'лес',
+    'кошка', 'рынок', 'песня', 'мост', 'облако', 'река', 'окно', 'сад',
+)
+
+
+def words(count):
+    return ' '.join(random.choices(WORDS, k=count))
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу синтетическими данными для нагрузочных замеров.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        self.batch_size = options['batch_size']
+        now = timezone.now()
+
+        password = make_password(None)
+        user_ids = self.create(User, options['users'], lambda i: User(
+            username=f'seed_{now.timestamp():.0f}_{i}',
+            password=password,
+            date_joined=now,
+        ))
+        category_ids = self.create(
+            Category, options['categories'], lambda i: Category(
+                title=words(2).capitalize(),
+                description=words(20),
+                slug=f'seed-{now.timestamp():.0f}-{i}',
+                is_published=random.random() > 0.1,
+            )
+        )
+        location_ids = self.create(
+            Location, options['locations'], lambda i: Location(
+                name=words(1).capitalize(),
+                is_published=random.random() > 0.1,
+            )
+        )
+        post_ids = self.create(Post, options['posts'], lambda i: Post(
+            title=words(4).capitalize(),
+            text=words(random.randint(20, 200)),
+            pub_date=now - timedelta(minutes=random.randint(-10000, 10**6)),
+            author_id=random.choice(user_ids),
+            category_id=random.choice(category_ids),
+            location_id=(random.choice(location_ids)
+                         if random.random() > 0.3 else None),
+            is_published=random.random() > 0.05,
+        ))
+        self.create(Comment, options['comments'], lambda i: Comment(
+            text=words(random.randint(3, 40)),
+            author_id=random.choice(user_ids),
+            post_id=random.choice(post_ids),
+        ), collect_ids=False)
+
+        self.stdout.write('Пересчёт счётчиков комментариев...')
+        Post.objects.recount_comments()
+        Post.objects.sync_visibility()
+        AuthorStats.objects.rebuild()
+        categories.refresh()
+        locations.refresh()
+        bump_feed_generation()
+        self.stdout.write(self.style.SUCCESS('Готово.'))
+
+    def create(self, model, total, build, collect_ids=True):
+        """Пакетно создаёт `total` объектов и возвращает их id."""
+        last_pk = (model.objects.order_by('-pk')
+                   .values_list('pk', flat=True).first() or 0)
+        for start in range(0, total, self.batch_size):
+            batch = [build(i) for i in
+                     range(start, min(start + self.batch_size, total))]
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: '
+                f'{start + len(batch)}/{total}'
+            )
+        if not collect_ids:
+            return []
+        return list(model.objects.filter(pk__gt=last_pk)
+                    .values_list('pk', flat=True))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Проверяет и чинит флаги видимости постов по их категориям'
+            ' и локациям.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только показать число постов с разошедшимися флагами.',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            stale = Post.objects.with_stale_visibility().count()
+            self.stdout.write(f'Постов с разошедшимися флагами: {stale}')
+            return
+        repaired = Post.objects.sync_visibility()
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено постов: {repaired}')
+        )
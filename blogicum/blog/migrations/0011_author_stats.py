@@ -0,0 +1,60 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:27
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def fill_author_stats(apps, schema_editor):
+    AuthorStats = apps.get_model('blog', 'AuthorStats')
+    Comment = apps.get_model('blog', 'Comment')
+    Post = apps.get_model('blog', 'Post')
+    User = apps.get_model('auth', 'User')
+
+    def total(model, **filters):
+        return Coalesce(Subquery(
+            model.objects.filter(author=OuterRef('user_id'), **filters)
+            .order_by().values('author')
+            .annotate(total=Count('pk')).values('total')
+        ), 0)
+
+    AuthorStats.objects.bulk_create(
+        AuthorStats(user_id=pk)
+        for pk in User.objects.values_list('pk', flat=True)
+    )
+    AuthorStats.objects.update(
+        post_count=total(Post),
+        published_count=total(Post, is_published=True),
+        comment_count=total(Comment),
+        last_post_at=Subquery(
+            Post.objects.filter(author=OuterRef('user_id'))
+            .order_by('-created_at').values('created_at')[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0010_post_updated_at_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='auth.user', verbose_name='Автор')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Публикаций')),
+                ('published_count', models.PositiveIntegerField(default=0, verbose_name='Опубликовано')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('last_post_at', models.DateTimeField(blank=True, null=True, verbose_name='Последняя публикация')),
+            ],
+            options={
+                'verbose_name': 'сводка по автору',
+                'verbose_name_plural': 'Сводки по авторам',
+            },
+        ),
+        migrations.RunPython(fill_author_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+from django.db import migrations
+
+CREATE_INDEX = (
+    "CREATE VIRTUAL TABLE blog_post_fts USING fts5("
+    "title, text, content='blog_post', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN "
+    "INSERT INTO blog_post_fts(rowid, title, text) "
+    "VALUES (new.id, new.title, new.text); END",
+    "CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN "
+    "INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); END",
+    "CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, text "
+    "ON blog_post BEGIN "
+    "INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); "
+    "INSERT INTO blog_post_fts(rowid, title, text) "
+    "VALUES (new.id, new.title, new.text); END",
+    "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild')",
+)
+DROP_INDEX = (
+    'DROP TRIGGER IF EXISTS blog_post_fts_insert',
+    'DROP TRIGGER IF EXISTS blog_post_fts_delete',
+    'DROP TRIGGER IF EXISTS blog_post_fts_update',
+    'DROP TABLE IF EXISTS blog_post_fts',
+)
+
+
+def fts5_supported(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        return ('ENABLE_FTS5',) in cursor.fetchall()
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite' or not fts5_supported(connection):
+        return
+    for sql in CREATE_INDEX:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_INDEX:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_author_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+CREATE_INDEX = (
+    "CREATE VIRTUAL TABLE blog_comment_fts USING fts5("
+    "text, content='blog_comment', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER blog_comment_fts_insert AFTER INSERT ON blog_comment "
+    "BEGIN INSERT INTO blog_comment_fts(rowid, text) "
+    "VALUES (new.id, new.text); END",
+    "CREATE TRIGGER blog_comment_fts_delete AFTER DELETE ON blog_comment "
+    "BEGIN INSERT INTO blog_comment_fts(blog_comment_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER blog_comment_fts_update AFTER UPDATE OF text "
+    "ON blog_comment BEGIN "
+    "INSERT INTO blog_comment_fts(blog_comment_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO blog_comment_fts(rowid, text) "
+    "VALUES (new.id, new.text); END",
+    "INSERT INTO blog_comment_fts(blog_comment_fts) VALUES ('rebuild')",
+)
+DROP_INDEX = (
+    'DROP TRIGGER IF EXISTS blog_comment_fts_insert',
+    'DROP TRIGGER IF EXISTS blog_comment_fts_delete',
+    'DROP TRIGGER IF EXISTS blog_comment_fts_update',
+    'DROP TABLE IF EXISTS blog_comment_fts',
+)
+
+
+def fts5_supported(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        return ('ENABLE_FTS5',) in cursor.fetchall()
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite' or not fts5_supported(connection):
+        return
+    for sql in CREATE_INDEX:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_INDEX:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['created_at'], name='comment_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['title'], name='post_title_idx'),
+        ),
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_visibility(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.filter(
+        is_published=True, category__is_published=True
+    ).update(is_visible=True)
+    Post.objects.filter(
+        location__is_published=True
+    ).update(public_location=models.F('location'))
+
+
+# SQLite пересоздаёт blog_post при добавлении полей, и триггеры
+# полнотекстового индекса (0012_post_search) пропадают вместе со старой
+# таблицей.
+SEARCH_TRIGGERS = (
+    'DROP TRIGGER IF EXISTS blog_post_fts_insert',
+    'DROP TRIGGER IF EXISTS blog_post_fts_delete',
+    'DROP TRIGGER IF EXISTS blog_post_fts_update',
+    "CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN "
+    "INSERT INTO blog_post_fts(rowid, title, text) "
+    "VALUES (new.id, new.title, new.text); END",
+    "CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN "
+    "INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); END",
+    "CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, text "
+    "ON blog_post BEGIN "
+    "INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); "
+    "INSERT INTO blog_post_fts(rowid, title, text) "
+    "VALUES (new.id, new.title, new.text); END",
+)
+
+
+def restore_search_triggers(apps, schema_editor):
+    connection = schema_editor.connection
+    if (connection.vendor != 'sqlite' or 'blog_post_fts'
+            not in connection.introspection.table_names()):
+        return
+    for sql in SEARCH_TRIGGERS:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_comment_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop,
+                             restore_search_triggers),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_published_feed_idx',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_visible',
+            field=models.BooleanField(default=False, editable=False, help_text='Опубликован сам пост и его категория.', verbose_name='Виден в лентах'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='public_location',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, help_text='Местоположение поста, если оно опубликовано.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='blog.location', verbose_name='Показываемое местоположение'),
+        ),
+        migrations.RunPython(fill_visibility, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['-pub_date', '-id'], name='post_published_feed_idx'),
+        ),
+        migrations.RunPython(restore_search_triggers,
+                             migrations.RunPython.noop),
+    ]
@@ -19,9 +19,18 @@ class PostMixin:
 
 
 class DispathMixin(PostMixin):
+    """Пускает к посту только автора; пост загружается один раз."""
+
     pk_url_kwarg = 'post_id'
+    _object = None
+
+    def get_object(self, queryset=None):
+        if self._object is None:
+            self._object = super().get_object(queryset)
+        return self._object
 
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
+        if (not request.user.is_authenticated
+                or self.get_object().author_id != request.user.pk):
             return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
         return super().dispatch(request, *args, **kwargs)
@@ -1,5 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 
 from core.canstants import MAX_FIELD_LENGTH
 from core.models import PublishingModel
@@ -40,6 +43,103 @@ class Location(PublishingModel):
         return self.name
 
 
+class PostQuerySet(models.QuerySet):
+    """Построитель запросов для лент публикаций."""
+
+    FEED_FIELDS = (
+        'title',
+        'text',
+        'pub_date',
+        'image',
+        'image_variants',
+        'is_published',
+        'comment_count',
+        'updated_at',
+        'author__username',
+        'category',
+        'location',
+        'is_visible',
+        'public_location',
+    )
+
+    def published(self, now=None):
+        return self.filter(
+            pub_date__lte=now or timezone.now(),
+            is_visible=True,
+        )
+
+    def actual_comment_count(self):
+        comments = (Comment.objects.filter(post=OuterRef('pk'))
+                    .order_by().values('post')
+                    .annotate(total=Count('pk')).values('total'))
+        return Coalesce(Subquery(comments), 0)
+
+    def visible_to(self, user, now=None):
+        """Посты, которые может открыть пользователь, — одним условием."""
+        visible = models.Q(
+            pub_date__lte=now or timezone.now(),
+            is_visible=True,
+        )
+        if user.is_authenticated:
+            visible |= models.Q(author_id=user.pk)
+        return self.filter(visible)
+
+    def with_stale_comment_count(self):
+        return (self.annotate(actual_count=self.actual_comment_count())
+                .exclude(comment_count=models.F('actual_count')))
+
+    def recount_comments(self):
+        """Одним UPDATE чинит счётчики, разошедшиеся с комментариями."""
+        stale = self.with_stale_comment_count().values('pk')
+        return Post.objects.filter(pk__in=stale).update(
+            comment_count=self.actual_comment_count()
+        )
+
+    def actual_visibility(self):
+        """Ожидаемые значения `is_visible` и `public_location`."""
+        category_published = Exists(Category.objects.filter(
+            pk=OuterRef('category_id'), is_published=True))
+        location_published = Exists(Location.objects.filter(
+            pk=OuterRef('location_id'), is_published=True))
+        return {
+            'is_visible': models.Case(
+                models.When(models.Q(category_published, is_published=True),
+                            then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            ),
+            'public_location': models.Case(
+                models.When(location_published, then=models.F('location')),
+                default=None,
+            ),
+        }
+
+    def with_stale_visibility(self):
+        expected = self.actual_visibility()
+        return (self.annotate(expected_visible=expected['is_visible'],
+                              expected_location=expected['public_location'])
+                .exclude(models.Q(is_visible=models.F('expected_visible'))
+                         & (models.Q(public_location=models.F(
+                             'expected_location'))
+                            | models.Q(public_location__isnull=True,
+                                       expected_location__isnull=True))))
+
+    def sync_visibility(self):
+        """Одним UPDATE чинит флаги, разошедшиеся с категориями и локациями."""
+        stale = self.with_stale_visibility().values('pk')
+        return Post.objects.filter(pk__in=stale).update(
+            updated_at=timezone.now(), **self.actual_visibility()
+        )
+
+    def for_feed(self):
+        """Подтягивает в одном запросе всё, что нужно карточке поста.
+
+        Категории и локации подставляются из справочников
+        (blog.lookups.attach_lookups), а не соединяются в запросе.
+        """
+        return self.select_related('author').only(*self.FEED_FIELDS)
+
+
 class Post(PublishingModel):
     author = models.ForeignKey(
         User,
@@ -74,11 +174,62 @@ class Post(PublishingModel):
         verbose_name="Категория",
     )
     image = models.ImageField('Фото', upload_to='post_images', blank=True)
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Уменьшенные копии фото",
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество комментариев",
+    )
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        verbose_name="Изменено",
+    )
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name="Виден в лентах",
+        help_text="Опубликован сам пост и его категория.",
+    )
+    public_location = models.ForeignKey(
+        Location,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=False,
+        related_name="+",
+        verbose_name="Показываемое местоположение",
+        help_text="Местоположение поста, если оно опубликовано.",
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                condition=models.Q(is_visible=True),
+                name='post_published_feed_idx',
+            ),
+            models.Index(
+                fields=['category', '-pub_date', '-id'],
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_feed_idx',
+            ),
+            models.Index(fields=['title'], name='post_title_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -106,6 +257,95 @@ class Comment(models.Model):
         verbose_name_plural = "Комментарии"
         default_related_name = "comments"
         ordering = ('created_at',)
+        indexes = [
+            models.Index(
+                fields=['post', 'created_at'],
+                name='comment_post_created_idx',
+            ),
+            models.Index(fields=['created_at'], name='comment_created_idx'),
+        ]
 
     def __str__(self):
         return f'Комментарий от {self.author}'
+
+
+class AuthorStatsQuerySet(models.QuerySet):
+
+    def bump(self, user_id, **deltas):
+        """Прибавляет к счётчикам автора `deltas`.
+
+        Строка заводится только ради прироста: если её нет при
+        уменьшении, автор уже удаляется и считать нечего. Счётчики не
+        опускаются ниже нуля.
+        """
+        changes = {name: Greatest(models.F(name) + delta, 0)
+                   for name, delta in deltas.items() if delta}
+        if not changes or user_id is None:
+            return
+        if any(delta > 0 for delta in deltas.values()):
+            self.bulk_create([AuthorStats(user_id=user_id)],
+                             ignore_conflicts=True)
+        self.filter(user_id=user_id).update(**changes)
+
+    def refresh_last_post(self, user_id):
+        latest = (Post.objects.filter(author_id=user_id)
+                  .order_by('-created_at').values('created_at')[:1])
+        self.filter(user_id=user_id).update(last_post_at=Subquery(latest))
+
+    def rebuild(self):
+        """Пересчитывает сводки всех авторов по постам и комментариям."""
+        def total(queryset, field, **filters):
+            return Coalesce(Subquery(
+                queryset.filter(**{field: OuterRef('user_id')}, **filters)
+                .order_by().values(field)
+                .annotate(total=Count('pk')).values('total')
+            ), 0)
+
+        missing = User.objects.filter(stats__isnull=True).values_list(
+            'pk', flat=True)
+        self.bulk_create([AuthorStats(user_id=pk) for pk in missing])
+        latest = (Post.objects.filter(author_id=OuterRef('user_id'))
+                  .order_by('-created_at').values('created_at')[:1])
+        return self.update(
+            post_count=total(Post.objects, 'author'),
+            published_count=total(Post.objects, 'author', is_published=True),
+            comment_count=total(Comment.objects, 'author'),
+            last_post_at=Subquery(latest),
+        )
+
+
+class AuthorStats(models.Model):
+    """Сводка по автору для страницы профиля.
+
+    Обновляется при сохранении и удалении постов и комментариев
+    (blog.signals), поэтому профиль не считает посты автора на лету.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Автор',
+    )
+    post_count = models.PositiveIntegerField(
+        default=0, verbose_name='Публикаций'
+    )
+    published_count = models.PositiveIntegerField(
+        default=0, verbose_name='Опубликовано'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0, verbose_name='Комментариев'
+    )
+    last_post_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Последняя публикация'
+    )
+
+    objects = AuthorStatsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'сводка по автору'
+        verbose_name_plural = 'Сводки по авторам'
+
+    def __str__(self):
+        return f'Сводка {self.user_id}'
@@ -0,0 +1,178 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorPage:
+    """Страница ключевой пагинации.
+
+    Повторяет интерфейс `django.core.paginator.Page`, насколько это
+    возможно без знания общего числа страниц.
+    """
+
+    def __init__(self, object_list, paginator, next_cursor=None,
+                 previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Пагинация по ключу `(ordering[0], ordering[1])` без OFFSET и COUNT.
+
+    Курсор — непрозрачный токен с направлением и значениями ключа
+    крайнего объекта соседней страницы.
+    """
+
+    is_cursor = True
+
+    def __init__(self, object_list, per_page,
+                 ordering=('-pub_date', '-id')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = ordering
+        self.fields = [name.lstrip('-') for name in ordering]
+
+    def encode_cursor(self, obj, direction):
+        values = [str(getattr(obj, name)) for name in self.fields]
+        raw = json.dumps([direction, *values]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, *values = json.loads(base64.urlsafe_b64decode(padded))
+            if (direction not in (NEXT, PREVIOUS)
+                    or len(values) != len(self.fields)):
+                raise ValueError(cursor)
+            model_meta = self.object_list.model._meta
+            values = [model_meta.get_field(name).to_python(value)
+                      for name, value in zip(self.fields, values)]
+        except (binascii.Error, TypeError, ValueError,
+                ValidationError) as error:
+            raise InvalidCursor(cursor) from error
+        if any(value is None for value in values):
+            raise InvalidCursor(cursor)
+        return direction, values
+
+    def _after(self, values, reverse):
+        """Условие «объект стоит после ключа» в порядке выдачи."""
+        lookups = []
+        for name, ordering in zip(self.fields, self.ordering):
+            descending = ordering.startswith('-') != reverse
+            lookups.append(f'{name}__lt' if descending else f'{name}__gt')
+        return (Q(**{lookups[0]: values[0]})
+                | Q(**{self.fields[0]: values[0], lookups[1]: values[1]}))
+
+    def _reversed_ordering(self):
+        return [name[1:] if name.startswith('-') else f'-{name}'
+                for name in self.ordering]
+
+    def page(self, cursor=None):
+        direction, values = (
+            self.decode_cursor(cursor) if cursor else (NEXT, None)
+        )
+        reverse = direction == PREVIOUS
+        queryset = self.object_list.order_by(
+            *(self._reversed_ordering() if reverse else self.ordering)
+        )
+        if values is not None:
+            queryset = queryset.filter(self._after(values, reverse))
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+        has_next = has_more if not reverse else True
+        has_previous = values is not None if not reverse else has_more
+        return CursorPage(
+            rows,
+            self,
+            next_cursor=(self.encode_cursor(rows[-1], NEXT)
+                         if rows and has_next else None),
+            previous_cursor=(self.encode_cursor(rows[0], PREVIOUS)
+                             if rows and has_previous else None),
+        )
+
+    def get_page(self, cursor=None):
+        """Как `Paginator.get_page`: при битом курсоре — первая страница."""
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page()
+
+
+def estimate_rows(model, using='default'):
+    """Примерное число строк таблицы `model` без её полного чтения.
+
+    PostgreSQL хранит оценку в статистике планировщика; на остальных
+    СУБД оценкой служит наибольший первичный ключ. None — оценки нет.
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class'
+                ' WHERE oid = %s::regclass',
+                [connection.ops.quote_name(model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        return row[0] if row and row[0] >= 0 else None
+    return model._base_manager.using(using).aggregate(
+        estimate=Max('pk'))['estimate']
+
+
+class EstimatedCountPaginator(Paginator):
+    """`Paginator`, который не считает строки большой таблицы целиком.
+
+    Для выборки без условий берётся оценка `estimate_rows()`, если она
+    больше `exact_count_limit`; отфильтрованные выборки и небольшие
+    таблицы считаются точно.
+    """
+
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimate_rows(self.object_list.model,
+                                     self.object_list.db)
+            if estimate is not None and estimate > self.exact_count_limit:
+                return estimate
+        return super().count
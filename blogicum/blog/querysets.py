@@ -1,31 +1,118 @@
+import hashlib
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Count
 from django.utils import timezone
 
 from blog.models import Post
+from blog.paginators import CursorPaginator
 from core.canstants import POST_COUNT
+from core.page_cache import after_commit
 
+FEED_GENERATION_KEY = 'feed_generation'
 
-def limited_access_posts():
-    query_set = (Post.objects.all().filter(
-        pub_date__lte=timezone.now(),
-        is_published=True,
-        category__is_published=True,
-    )
-    )
-    return query_set
+
+def feed_now():
+    """Текущее время, округлённое вниз до `FEED_TIME_BUCKET` секунд."""
+    now = timezone.now()
+    bucket = settings.FEED_TIME_BUCKET
+    if not bucket:
+        return now
+    seconds = int(now.timestamp()) // bucket * bucket
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
 
 
-def displayed_posts(queryset=Post.objects.all()):
+def limited_access_posts(now=None):
+    return Post.objects.published(now)
+
+
+def displayed_posts(queryset=None):
+    if queryset is None:
+        queryset = Post.objects.all()
     filtred_queryset = (queryset.
-                        annotate(comment_count=Count('post')).
-                        order_by("-pub_date"))
+                        for_feed().
+                        order_by("-pub_date", "-id"))
 
     return filtred_queryset
 
 
-def get_paginate(post_list, request):
-    paginator = Paginator(post_list, POST_COUNT)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+def bump_feed_generation():
+    """Сбрасывает кэш страниц лент после изменения их содержимого.
+
+    Внутри транзакции поколение меняется ещё раз после COMMIT.
+    """
+    def bump():
+        cache.add(FEED_GENERATION_KEY, 0, None)
+        try:
+            cache.incr(FEED_GENERATION_KEY)
+        except ValueError:
+            cache.set(FEED_GENERATION_KEY, 1, None)
+    after_commit(bump)
+
+
+def feed_page_key(post_list, page_param):
+    generation = cache.get(FEED_GENERATION_KEY, 0)
+    query = f'{post_list.query}|{page_param}|{generation}'
+    return 'feed_page:' + hashlib.md5(query.encode()).hexdigest()
+
+
+def load_cached_page(paginator, post_list, page_param):
+    """Страница ленты из общего кэша или None."""
+    cached = cache.get(feed_page_key(post_list, page_param))
+    if cached is None:
+        return None
+    page_obj, count = cached
+    if count is not None:
+        paginator.count = count
+    page_obj.paginator = paginator
+    return page_obj
+
+
+def store_cached_page(page_obj, post_list, page_param):
+    paginator = page_obj.paginator
+    page_obj.object_list = list(page_obj.object_list)
+    page_obj.paginator = None
+    cache.set(feed_page_key(post_list, page_param),
+              (page_obj, paginator.__dict__.get('count')),
+              settings.FEED_TIME_BUCKET)
+    page_obj.paginator = paginator
     return page_obj
+
+
+def get_cached_page(paginator, post_list, page_param, get_page):
+    """Страница ленты из общего кэша или из БД с сохранением в кэш.
+
+    В ключ входит текст запроса, а значит и граница времени из
+    `feed_now()`, поэтому запись живёт не дольше одного интервала.
+    """
+    page_obj = load_cached_page(paginator, post_list, page_param)
+    if page_obj is None:
+        page_obj = store_cached_page(get_page(), post_list, page_param)
+    return page_obj
+
+
+def uses_cursor(request):
+    return request.GET.get('cursor') is not None or (
+        settings.CURSOR_PAGINATION and 'page' not in request.GET
+    )
+
+
+def get_paginate(post_list, request, per_page=POST_COUNT, count=None):
+    """Страница ленты: по курсору или, для старых ссылок, по номеру.
+
+    Известное заранее число постов (`count`) избавляет `Paginator`
+    от отдельного COUNT-запроса.
+    """
+    if uses_cursor(request):
+        cursor = request.GET.get('cursor')
+        paginator = CursorPaginator(post_list, per_page)
+        return get_cached_page(paginator, post_list, f'cursor={cursor}',
+                               lambda: paginator.get_page(cursor))
+    paginator = Paginator(post_list, per_page)
+    if count is not None:
+        paginator.count = count
+    page_number = request.GET.get('page')
+    return get_cached_page(paginator, post_list, f'page={page_number}',
+                           lambda: paginator.get_page(page_number))
@@ -0,0 +1,109 @@
+"""Полнотекстовый поиск по постам и комментариям.
+
+На SQLite поиск идёт по FTS5-индексам `blog_post_fts` (заголовок и
+текст поста, миграция 0012_post_search) и `blog_comment_fts` (текст
+комментария, 0013_comment_search): таблицы хранят только индекс, а
+сами строки берут из исходных; триггеры обновляют их при любом
+изменении, включая пакетные вставки. SQLite теряет триггеры, когда
+миграция пересоздаёт таблицу, — такая миграция должна создать их
+заново (см. 0014_post_visibility). На других СУБД и на сборках SQLite
+без FTS5 поиск сводится к `icontains` по каждому слову.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+MAX_TERMS = 8
+# Вес совпадения в заголовке и в тексте поста для bm25().
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+
+
+def search_terms(query):
+    """Слова запроса без знаков препинания и операторов FTS5."""
+    return re.findall(r'\w+', query or '')[:MAX_TERMS]
+
+
+def match_expression(terms):
+    """Каждое слово — префикс, все слова обязательны."""
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+class FullTextIndex:
+    """FTS5-индекс по полям `fields` одной таблицы."""
+
+    def __init__(self, table, fields):
+        self.table = table
+        self.fields = fields
+        self._available = {}
+
+    def available(self, using='default'):
+        """Есть ли индекс на базе `using`."""
+        if using not in self._available:
+            connection = connections[using]
+            self._available[using] = (
+                connection.vendor == 'sqlite'
+                and self.table in connection.introspection.table_names()
+            )
+        return self._available[using]
+
+    def condition(self, terms, using='default'):
+        """Условие «строка подходит под все `terms`» для `filter()`."""
+        if self.available(using):
+            return Q(pk__in=RawSQL(
+                f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s',
+                (match_expression(terms),),
+            ))
+        condition = Q()
+        for term in terms:
+            matches = Q()
+            for field in self.fields:
+                matches |= Q(**{f'{field}__icontains': term})
+            condition &= matches
+        return condition
+
+    def filter(self, queryset, query):
+        """Строки, подходящие под `query`, без смены порядка `queryset`."""
+        terms = search_terms(query)
+        if not terms:
+            return queryset
+        return queryset.filter(self.condition(terms, queryset.db))
+
+    def rebuild(self, using='default'):
+        """Заново строит индекс по текущему содержимому таблицы."""
+        if not self.available(using):
+            return False
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')"
+            )
+        return True
+
+
+post_index = FullTextIndex('blog_post_fts', ('title', 'text'))
+comment_index = FullTextIndex('blog_comment_fts', ('text',))
+
+
+def search_posts(queryset, query):
+    """Посты `queryset`, подходящие под `query`, от лучших к худшим.
+
+    Индекс присоединяется к запросу, так что видимость, постраничный
+    вывод и подсчёт результатов остаются на стороне БД.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    if not post_index.available(queryset.db):
+        return queryset.filter(post_index.condition(terms, queryset.db))
+    table = post_index.table
+    post_table = queryset.model._meta.db_table
+    return queryset.extra(
+        select={'search_rank': (
+            f'bm25({table}, {TITLE_WEIGHT}, {TEXT_WEIGHT})'
+        )},
+        tables=[table],
+        where=[f'{table}.rowid = {post_table}.id', f'{table} MATCH %s'],
+        params=[match_expression(terms)],
+    ).order_by('search_rank', '-pub_date', '-id')
@@ -0,0 +1,215 @@
+import threading
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cards import card_key
+from .images import refresh_image_variants
+from .lookups import categories, locations
+from .models import AuthorStats, Category, Comment, Location, Post, User
+from .querysets import bump_feed_generation
+from core.page_cache import purge_pages
+
+
+def purge_feed_pages(category_ids):
+    """Сбрасывает кэш главной и страниц перечисленных категорий."""
+    slugs = Category.objects.filter(
+        pk__in=category_ids).values_list('slug', flat=True)
+    purge_pages('index', *(f'category:{slug}' for slug in slugs))
+
+
+def touch_posts(changes=None, **lookups):
+    """Меняет версию карточек постов, зависящих от изменённого объекта.
+
+    `changes` — поля постов, которые обновляются тем же UPDATE.
+    """
+    posts = Post.objects.filter(**lookups)
+    purge_feed_pages(posts.values('category_id'))
+    posts.update(updated_at=timezone.now(), **(changes or {}))
+    bump_feed_generation()
+
+
+def is_published(model, pk):
+    """Опубликована ли запись — по БД, а не по справочнику процесса."""
+    return pk is not None and model.objects.filter(
+        pk=pk, is_published=True).exists()
+
+
+@receiver(pre_save, sender=Post)
+def stamp_post(sender, instance, raw, **kwargs):
+    """Как `auto_now`, но `loaddata` сохраняет отметку из фикстуры."""
+    if not raw:
+        instance.updated_at = timezone.now()
+    instance.is_visible = (instance.is_published
+                           and is_published(Category, instance.category_id))
+    instance.public_location_id = (
+        instance.location_id
+        if is_published(Location, instance.location_id) else None
+    )
+    instance._saved = (
+        Post.objects.filter(pk=instance.pk)
+        .values('category_id', 'author_id', 'is_published').first()
+        if instance.pk else None
+    )
+
+
+_deleting = threading.local()
+
+
+def deleting_authors():
+    """Пользователи (id), которые удаляются в этом потоке прямо сейчас.
+
+    Их посты и комментарии удаляются каскадом вместе со сводкой, и
+    пересчитывать её незачем.
+    """
+    if not hasattr(_deleting, 'authors'):
+        _deleting.authors = set()
+    return _deleting.authors
+
+
+@receiver(pre_delete, sender=User)
+def mark_deleting_author(sender, instance, **kwargs):
+    deleting_authors().add(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def unmark_deleting_author(sender, instance, **kwargs):
+    deleting_authors().discard(instance.pk)
+
+
+def count_posts(*changes):
+    """Переносит в сводки авторов пары (состояние поста, +1 или -1)."""
+    deltas = defaultdict(Counter)
+    for post, sign in changes:
+        if post is None or post['author_id'] in deleting_authors():
+            continue
+        deltas[post['author_id']]['post_count'] += sign
+        if post['is_published']:
+            deltas[post['author_id']]['published_count'] += sign
+    for author_id, author_deltas in deltas.items():
+        AuthorStats.objects.bump(author_id, **author_deltas)
+
+
+@receiver(post_save, sender=Post)
+def post_changed(sender, instance, raw, created, **kwargs):
+    if not raw:
+        refresh_image_variants(instance)
+    saved = getattr(instance, '_saved', None)
+    purge_feed_pages([instance.category_id,
+                      saved and saved['category_id']])
+    bump_feed_generation()
+
+    current = {'author_id': instance.author_id,
+               'is_published': instance.is_published}
+    count_posts((saved, -1), (current, 1))
+    if created:
+        AuthorStats.objects.filter(user_id=instance.author_id).update(
+            last_post_at=instance.created_at)
+    elif saved is not None and saved['author_id'] != instance.author_id:
+        AuthorStats.objects.refresh_last_post(saved['author_id'])
+        AuthorStats.objects.refresh_last_post(instance.author_id)
+
+
+@receiver(post_delete, sender=Post)
+def forget_post_card(sender, instance, **kwargs):
+    cache.delete(card_key(instance))
+    purge_feed_pages([instance.category_id])
+    bump_feed_generation()
+    if instance.author_id in deleting_authors():
+        return
+    count_posts(({'author_id': instance.author_id,
+                  'is_published': instance.is_published}, -1))
+    AuthorStats.objects.refresh_last_post(instance.author_id)
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, update_fields, **kwargs):
+    if update_fields is not None and 'username' not in update_fields:
+        instance._old_username = instance.username
+        return
+    instance._old_username = (
+        User.objects.filter(pk=instance.pk)
+        .values_list('username', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=User)
+def author_renamed(sender, instance, created, **kwargs):
+    """Карточки показывают имя автора и ссылку на его профиль."""
+    old_username = getattr(instance, '_old_username', None)
+    if not created and old_username != instance.username:
+        touch_posts(author=instance)
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_slug(sender, instance, **kwargs):
+    instance._old_slug = (
+        Category.objects.filter(pk=instance.pk)
+        .values_list('slug', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed(sender, instance, signal, **kwargs):
+    """Сбрасывает кэш и флаг `is_visible` постов категории.
+
+    Удаляемая категория снимает посты с лент: ссылка на неё станет
+    пустой.
+    """
+    old_slug = getattr(instance, '_old_slug', None)
+    purge_pages(f'category:{instance.slug}',
+                *([f'category:{old_slug}'] if old_slug else []))
+    visible = signal is post_save and instance.is_published
+    touch_posts({'is_visible': F('is_published') if visible else False},
+                category=instance)
+
+
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def location_changed(sender, instance, signal, **kwargs):
+    visible = signal is post_save and instance.is_published
+    touch_posts({'public_location': instance if visible else None},
+                location=instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def refresh_categories(sender, **kwargs):
+    categories.refresh()
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def refresh_locations(sender, **kwargs):
+    locations.refresh()
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw, **kwargs):
+    """Обновляет карточку поста и счётчики комментариев.
+
+    Счётчик поста из фикстуры уже учитывает её комментарии.
+    """
+    counted = created and not raw
+    touch_posts({'comment_count': F('comment_count') + 1} if counted
+                else None, pk=instance.post_id)
+    if created:
+        AuthorStats.objects.bump(instance.author_id, comment_count=1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    """То же при удалении — из представления, админки или каскадом."""
+    touch_posts({'comment_count': Greatest(F('comment_count') - 1, 0)},
+                pk=instance.post_id)
+    if instance.author_id not in deleting_authors():
+        AuthorStats.objects.bump(instance.author_id, comment_count=-1)
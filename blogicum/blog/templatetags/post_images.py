@@ -0,0 +1,35 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+from blog.images import DERIVATIVE_SIZES
+
+register = template.Library()
+
+IMAGE_SIZES = '(max-width: 40rem) 100vw, 40rem'
+
+
+@register.simple_tag
+def post_image(post, size, css_class=''):
+    """Тег `<img>` с `srcset` из уменьшенных копий изображения поста."""
+    variants = post.image_variants
+    if size not in variants:
+        return format_html(
+            '<img class="{}" src="{}" loading="lazy" alt="">',
+            css_class, post.image.url,
+        )
+    srcset = ', '.join(
+        f'{default_storage.url(variants[name]["name"])} '
+        f'{variants[name]["width"]}w'
+        for name in DERIVATIVE_SIZES if name in variants
+    )
+    return format_html(
+        '<img class="{}" src="{}" srcset="{}" sizes="{}" width="{}" '
+        'height="{}" loading="lazy" alt="">',
+        css_class,
+        default_storage.url(variants[size]['name']),
+        srcset,
+        IMAGE_SIZES,
+        variants[size]['width'],
+        variants[size]['height'],
+    )
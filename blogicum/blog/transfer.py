@@ -0,0 +1,180 @@
+"""Потоковые импорт и экспорт содержимого блога.
+
+Формат — как у `dumpdata`: JSON-массив или NDJSON из объектов
+`{"model": ..., "pk": ..., "fields": {...}}`. Файл читается и пишется
+частями, объекты сохраняются пачками через `bulk_create`.
+"""
+import datetime
+import json
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.serializers.python import Deserializer, Serializer
+from django.db import transaction
+
+TRANSFER_MODELS = (
+    'auth.user',
+    'blog.category',
+    'blog.location',
+    'blog.post',
+    'blog.comment',
+)
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class TransferJSONEncoder(DjangoJSONEncoder):
+    """Как у `dumpdata`, но даты — с микросекундами, без потерь."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def iter_json_objects(stream):
+    """Объекты JSON-массива или NDJSON по одному, без чтения файла целиком."""
+    decoder = json.JSONDecoder()
+    buffer, position = '', 0
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n[,]':
+            position += 1
+        try:
+            obj, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = stream.read(READ_CHUNK_SIZE)
+            if not chunk:
+                if buffer[position:].strip():
+                    raise
+                return
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield obj
+
+
+def concrete_field_names(model):
+    return [field.name for field in model._meta.concrete_fields
+            if not field.primary_key]
+
+
+@contextmanager
+def raw_timestamps(model):
+    """Не даёт `bulk_create` затереть даты из файла текущим временем."""
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now', False)
+              or getattr(field, 'auto_now_add', False)]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class BlogImporter:
+    """Складывает объекты в пачки по моделям и сохраняет их.
+
+    Объекты, ссылающиеся на ещё не загруженные записи, откладываются
+    и повторяются после каждой пачки; в конце у оставшихся обнуляются
+    необязательные связи, а объекты с обязательными — пропускаются.
+    """
+
+    def __init__(self, batch_size=1000, ignore_conflicts=False):
+        self.batch_size = batch_size
+        self.ignore_conflicts = ignore_conflicts
+        self.batches = {label: [] for label in TRANSFER_MODELS}
+        self.pending = {label: [] for label in TRANSFER_MODELS}
+        self.created = {label: 0 for label in TRANSFER_MODELS}
+        self.skipped = {}
+
+    def add(self, data):
+        label = data.get('model', '').lower()
+        if label not in self.batches:
+            self.skipped[label] = self.skipped.get(label, 0) + 1
+            return
+        model = apps.get_model(label)
+        allowed = set(concrete_field_names(model))
+        data = {
+            'model': label,
+            'pk': data.get('pk'),
+            'fields': {name: value for name, value
+                       in data.get('fields', {}).items()
+                       if name in allowed},
+        }
+        self.batches[label].append(data)
+        if len(self.batches[label]) >= self.batch_size:
+            # Сначала сохраняются модели, на которые может ссылаться эта.
+            for dependency in TRANSFER_MODELS[
+                    :TRANSFER_MODELS.index(label) + 1]:
+                self.flush(dependency)
+
+    def flush(self, label, final=False):
+        batch = self.pending[label] + self.batches[label]
+        self.pending[label], self.batches[label] = [], []
+        if not batch:
+            return
+        model = apps.get_model(label)
+        objects = [item.object for item in Deserializer(batch)]
+        waiting = self.resolve(model, objects, final)
+        if final and waiting:
+            self.skipped[label] = self.skipped.get(label, 0) + len(waiting)
+        elif waiting:
+            self.pending[label] = [batch[index] for index in waiting]
+        ready = [obj for index, obj in enumerate(objects)
+                 if index not in waiting]
+        if ready:
+            with transaction.atomic(), raw_timestamps(model):
+                model.objects.bulk_create(
+                    ready, batch_size=self.batch_size,
+                    ignore_conflicts=self.ignore_conflicts,
+                )
+            self.created[label] += len(ready)
+
+    def resolve(self, model, objects, final):
+        """Индексы объектов с пока не найденными ссылками.
+
+        Внешние ключи проверяются одним запросом на поле для всей пачки.
+        На финальном проходе необязательные битые ссылки обнуляются.
+        """
+        waiting = set()
+        for field in model._meta.concrete_fields:
+            if not field.is_relation:
+                continue
+            ids = {getattr(obj, field.attname) for obj in objects} - {None}
+            missing = ids - set(field.related_model._default_manager
+                                .filter(pk__in=ids)
+                                .values_list('pk', flat=True))
+            for index, obj in enumerate(objects):
+                if getattr(obj, field.attname) not in missing:
+                    continue
+                if final and field.null:
+                    setattr(obj, field.attname, None)
+                else:
+                    waiting.add(index)
+        return waiting
+
+    def finish(self):
+        for label in TRANSFER_MODELS:
+            self.flush(label)
+        for label in TRANSFER_MODELS:
+            self.flush(label, final=True)
+
+
+def export_objects(batch_size=1000):
+    """Объекты для выгрузки: модели по порядку, чтение курсором."""
+    for label in TRANSFER_MODELS:
+        model = apps.get_model(label)
+        fields = concrete_field_names(model)
+        queryset = model._default_manager.order_by('pk').iterator(
+            chunk_size=batch_size
+        )
+        chunk = []
+        for obj in queryset:
+            chunk.append(obj)
+            if len(chunk) >= batch_size:
+                yield from Serializer().serialize(chunk, fields=fields)
+                chunk = []
+        if chunk:
+            yield from Serializer().serialize(chunk, fields=fields)
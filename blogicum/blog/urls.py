@@ -1,26 +1,40 @@
 from django.conf import settings
-from django.conf.urls.static import static
 from django.urls import path
 
-from . import views
+from . import async_views, views
 
 app_name = 'blog'
 
+if settings.ASYNC_VIEWS:
+    index_view = async_views.index
+    post_detail_view = async_views.post_detail
+    category_view = async_views.category_post
+    profile_view = async_views.profile
+else:
+    index_view = views.PostListView.as_view()
+    post_detail_view = views.PostDetailView.as_view()
+    category_view = views.category_post
+    profile_view = views.profile
+
 
 urlpatterns = [
     # Главная страница
     path('',
-         views.PostListView.as_view(),
+         index_view,
          name='index'),
     # Содержание поста
     path('posts/<int:post_id>/',
-         views.PostDetailView.as_view(),
+         post_detail_view,
          name='post_detail'),
 
     # Посты в категории
     path('category/<slug:category_slug>/',
-         views.category_post,
+         category_view,
          name='category_posts'),
+    # Поиск по постам
+    path('search/',
+         views.search,
+         name='search'),
     # Создание поста
     path('posts/create/',
          views.PostCreateView.as_view(),
@@ -51,9 +65,6 @@ urlpatterns = [
          name='edit_profile'),
 
     path('profile/<username>/',
-         views.profile,
+         profile_view,
          name='profile'),
-
-
-
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
@@ -1,20 +1,32 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.paginator import Paginator
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
+from django.utils.decorators import method_decorator
+from django.utils.http import urlencode
 from django.views.generic import (CreateView, DeleteView, 
                                   DetailView, ListView,
                                   UpdateView)
 
-from .forms import CommentForm, PostForm, UserForm
+from .cards import attach_cards
+from .conditions import (category_state, conditional, feed_count,
+                         feed_state, post_state, profile_state)
+from .forms import CommentForm, PostDeleteForm, UserForm
+from .lookups import attach_lookups, categories
 from .mixins import (DispathMixin, 
                      PostMixin, 
                      ProfileReverseMixin)
-from .models import Category, Comment, Post, User
-from .querysets import (displayed_posts, 
-                        get_paginate, 
+from .models import AuthorStats, Comment, Post, User
+from .paginators import CursorPaginator
+from .querysets import (displayed_posts,
+                        feed_now,
+                        get_paginate,
                         limited_access_posts)
-from core.canstants import POST_COUNT
+from .search import search_posts
+from core.canstants import COMMENT_COUNT, POST_COUNT
+from core.page_cache import cache_anonymous_page
 
 
 class PostCreateView(ProfileReverseMixin, PostMixin,
@@ -33,63 +45,122 @@ class PostUpdateView(DispathMixin, LoginRequiredMixin, UpdateView):
 
 class PostDeleteView(ProfileReverseMixin, DispathMixin,
                      LoginRequiredMixin, DeleteView):
+    queryset = Post.objects.select_related('location')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['form'] = PostForm(instance=self.object)
+        context['form'] = PostDeleteForm(instance=self.object)
         return context
 
 
+def comments_paginator(post_id):
+    comments = (Comment.objects.filter(post_id=post_id)
+                .select_related('author')
+                .only('text', 'created_at', 'post', 'author__username'))
+    return CursorPaginator(comments, COMMENT_COUNT,
+                           ordering=('created_at', 'id'))
+
+
+@method_decorator(conditional(post_state), name='dispatch')
 class PostDetailView(LoginRequiredMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
-    post_object = None
     pk_url_kwarg = 'post_id'
 
     def get_queryset(self):
-        self.post_object = get_object_or_404(Post, 
-                                             pk=self.kwargs['post_id'])   
-        if self.post_object.author == self.request.user:
-            return displayed_posts().filter(pk=self.kwargs['post_id'])
-        return (displayed_posts(limited_access_posts()).
-                filter(pk=self.kwargs['post_id']))
+        return displayed_posts(Post.objects.visible_to(self.request.user))
+
+    def get_object(self, queryset=None):
+        return attach_lookups([super().get_object(queryset)])[0]
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.post.all().select_related(
-            'author'
+        context['comments'] = comments_paginator(self.object.pk).get_page(
+            self.request.GET.get('comment_cursor')
         )
         return context
 
 
+@method_decorator([cache_anonymous_page('index'), conditional(feed_state)],
+                  name='dispatch')
 class PostListView(ListView):
     model = Post
     template_name = 'blog/index.html'
-    queryset = displayed_posts(
-        queryset=limited_access_posts())
     paginate_by = POST_COUNT
 
+    def get_queryset(self):
+        return displayed_posts(queryset=limited_access_posts(feed_now()))
+
+    def paginate_queryset(self, queryset, page_size):
+        page_obj = get_paginate(queryset, self.request, page_size,
+                                feed_count(self.request))
+        attach_cards(page_obj)
+        return (page_obj.paginator, page_obj, page_obj.object_list,
+                page_obj.has_other_pages())
+
 
+@cache_anonymous_page('category:{category_slug}')
+@conditional(category_state)
 def category_post(request, category_slug):
-    category = get_object_or_404(
-        Category, slug=category_slug, is_published=True
-    )
+    category = categories.get_by_slug(category_slug)
+    if category is None or not category.is_published:
+        raise Http404('Категория не найдена.')
 
-    post_list = (displayed_posts(limited_access_posts())
+    post_list = (displayed_posts(limited_access_posts(feed_now()))
                  .filter(category=category))
-    page_obj = get_paginate(post_list, request)
+    page_obj = get_paginate(post_list, request, count=feed_count(request))
+    attach_cards(page_obj)
     return render(request, 'blog/category.html',
                   {'page_obj': page_obj, 'category': category_slug})
 
 
+def search(request):
+    query = request.GET.get('q', '').strip()
+    post_list = search_posts(
+        displayed_posts(limited_access_posts(feed_now())), query
+    )
+    page_obj = Paginator(post_list, POST_COUNT).get_page(
+        request.GET.get('page')
+    )
+    attach_cards(page_obj)
+    return render(request, 'blog/search.html', {
+        'page_obj': page_obj,
+        'query': query,
+        'page_query': urlencode({'q': query}) + '&',
+    })
+
+
+PROFILE_FIELDS = ('username', 'first_name', 'last_name', 'date_joined',
+                  'is_staff', 'stats')
+
+
+def get_profile(request, username):
+    """Автор и его сводка (`AuthorStats`) или None, если сводки нет.
+
+    Свой профиль пользователь видит без повторной загрузки строки
+    `request.user`.
+    """
+    if request.user.is_authenticated and request.user.username == username:
+        user = request.user
+        return user, AuthorStats.objects.filter(user_id=user.pk).first()
+    user = get_object_or_404(
+        User.objects.select_related('stats').only(*PROFILE_FIELDS),
+        username=username,
+    )
+    return user, getattr(user, 'stats', None)
+
+
+@conditional(profile_state)
 def profile(request, username):
-    user = get_object_or_404(User, username=username)
+    user, stats = get_profile(request, username)
     post_list = (displayed_posts()
                  .filter(author_id=user.id))
-    page_obj = get_paginate(post_list, request)
+    page_obj = get_paginate(post_list, request,
+                            count=stats.post_count if stats else 0)
+    attach_cards(page_obj)
     return render(request, 'blog/profile.html',
-                  {'profile': user, 'page_obj': page_obj})
+                  {'profile': user, 'stats': stats, 'page_obj': page_obj})
 
 
 class ProfileUpdateView(ProfileReverseMixin, 
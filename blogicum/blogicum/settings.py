@@ -1,5 +1,8 @@
+import os
 from pathlib import Path
 
+from core.db import database_from_env
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
@@ -14,6 +17,7 @@ ALLOWED_HOSTS = [
 
 INSTALLED_APPS = [
     'django_bootstrap5',
+    'core.apps.CoreConfig',
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
     'django.contrib.admin',
@@ -26,12 +30,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.QueryInstrumentationMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
@@ -57,10 +63,45 @@ TEMPLATES = [
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
+# Подключение задаётся через DATABASE_URL и DB_* (см. core.db),
+# по умолчанию — SQLite-файл рядом с manage.py. Соединения переживают
+# запрос (CONN_MAX_AGE) и проверяются перед следующим
+# (core.signals.check_connections).
 DATABASES = {
-    'default': {
+    'default': database_from_env(os.environ, BASE_DIR / 'db.sqlite3'),
+}
+
+# Применяются к каждому соединению SQLite (core.signals.tune_sqlite):
+# WAL не даёт записи блокировать чтение, busy_timeout ждёт блокировку
+# вместо ошибки «database is locked».
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Чтение через отдельное соединение SQLite в режиме только для чтения.
+SQLITE_READ_CONNECTION = (
+    os.environ.get('SQLITE_READ_CONNECTION') == '1'
+    and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3'
+)
+if SQLITE_READ_CONNECTION:
+    DATABASES['replica'] = {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': f"file:{DATABASES['default']['NAME']}?mode=ro",
+        'OPTIONS': {'uri': True},
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['core.routers.ReadReplicaRouter']
+
+# Кэш карточек и страниц лент. Чтобы воркеры делили кэш, в продакшене
+# здесь указывается общий бэкенд, например PyMemcacheCache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
@@ -94,6 +135,7 @@ USE_TZ = True
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
 MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_URL = '/media/'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
@@ -105,6 +147,51 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
+# Сюда собирает файлы collectstatic; вне DEBUG имена получают хэш
+# содержимого, а рядом кладутся сжатые gzip/brotli копии.
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+if not DEBUG:
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+# Время кэширования в браузере для статики и загрузок без хэша в имени
+# (core.middleware.StaticFilesMiddleware); файлы с хэшем — бессрочно.
+STATIC_FILES_MAX_AGE = 60 * 60
 LOGIN_REDIRECT_URL = 'blog:index'
 
+# Ленты постов листаются по курсору (?cursor=) вместо ?page=N.
+CURSOR_PAGINATION = False
+
+# Граница «уже опубликовано» в лентах округляется вниз до этого числа секунд:
+# одинаковые запросы в пределах интервала отдаются из кэша.
+FEED_TIME_BUCKET = 60
+
+# Асинхронные версии лент и страницы поста (blog.async_views). Под ASGI
+# включаются по умолчанию (blogicum/asgi.py), под WSGI — ASYNC_VIEWS=1.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS') == '1'
+# Независимые запросы асинхронной страницы идут в БД параллельно,
+# каждый из своего потока со своим соединением. Тестам, которые
+# работают внутри транзакции, нужен ASYNC_VIEWS_PARALLEL_DB=0.
+ASYNC_VIEWS_PARALLEL_DB = os.environ.get('ASYNC_VIEWS_PARALLEL_DB') != '0'
+
+# Сколько секунд анонимные посетители получают страницы лент и
+# «О проекте»/«Правила» из кэша (core.page_cache). Изменения постов,
+# категорий, локаций и комментариев сбрасывают нужные страницы сразу,
+# а отложенные посты появляются в ленте не позже чем через этот срок.
+PAGE_CACHE_TIMEOUT = 60
+
+# Учёт SQL-запросов по представлениям: заголовок Server-Timing и сводка
+# на странице pages:queries. В строгом режиме превышение бюджета — ошибка.
+QUERY_INSTRUMENTATION = DEBUG
+QUERY_INSTRUMENTATION_NAMESPACES = ('blog', 'pages')
+QUERY_BUDGET_STRICT = False
+QUERY_BUDGETS = {
+    'blog:index': 4,
+    'blog:category_posts': 5,
+    'blog:profile': 5,
+    # Пятый запрос — состояние поста для ETag (blog.conditions); при
+    # повторных открытиях оно берётся из кэша.
+    'blog:post_detail': 5,
+    'pages:about': 2,
+    'pages:rules': 2,
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
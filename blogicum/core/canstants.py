@@ -1,2 +1,6 @@
 MAX_FIELD_LENGTH = 256
 POST_COUNT = 10
+COMMENT_COUNT = 50
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+LOOKUP_CACHE_TIMEOUT = 60 * 60 * 24
+LOOKUP_VERSION_TIMEOUT = 10
@@ -0,0 +1,296 @@
+import heapq
+import mimetypes
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.db import connections
+from django.http import FileResponse, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+SLOWEST_KEPT = 5
+
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+RANGE_RE = re.compile(r'bytes=(\d*)-(\d*)')
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def fingerprint(sql):
+    """SQL без литералов: одинаковые запросы с разными параметрами."""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+(\.\d+)?\b', '?', sql)
+    return re.sub(r'\((?:\?, )+\?\)', '(...)', sql)
+
+
+class ViewQueryStats:
+    def __init__(self, view_name):
+        self.view_name = view_name
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_time = 0.0
+        self.duplicates = Counter()
+        self.slowest = []
+
+    @property
+    def budget(self):
+        return settings.QUERY_BUDGETS.get(self.view_name)
+
+    @property
+    def avg_queries(self):
+        return self.queries / self.requests if self.requests else 0
+
+    def add(self, queries):
+        self.requests += 1
+        self.queries += len(queries)
+        self.max_queries = max(self.max_queries, len(queries))
+        self.db_time += sum(duration for _, duration in queries)
+        seen = Counter(fingerprint(sql) for sql, _ in queries)
+        self.duplicates.update(
+            {sql: count - 1 for sql, count in seen.items() if count > 1}
+        )
+        for sql, duration in queries:
+            item = (duration, sql)
+            if len(self.slowest) < SLOWEST_KEPT:
+                heapq.heappush(self.slowest, item)
+            else:
+                heapq.heappushpop(self.slowest, item)
+
+    def slowest_queries(self):
+        return sorted(self.slowest, reverse=True)
+
+
+def get_query_stats():
+    with _stats_lock:
+        return sorted(_stats.values(), key=lambda stats: stats.view_name)
+
+
+def reset_query_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+
+class QueryInstrumentationMiddleware:
+    """Считает SQL-запросы каждого представления.
+
+    Включается настройкой `QUERY_INSTRUMENTATION`. Число запросов и
+    время в БД уходят в заголовок `Server-Timing`, сводка по
+    представлениям копится в памяти процесса. При
+    `QUERY_BUDGET_STRICT` превышение `QUERY_BUDGETS` — исключение.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        if match is None or not set(match.namespaces) & set(
+                settings.QUERY_INSTRUMENTATION_NAMESPACES):
+            return response
+        view_name = match.view_name
+        queries = recorder.queries
+        with _stats_lock:
+            _stats.setdefault(view_name, ViewQueryStats(view_name)).add(
+                queries
+            )
+
+        db_time = sum(duration for _, duration in queries) * 1000
+        response['Server-Timing'] = (
+            f'db;dur={db_time:.2f};desc="{len(queries)} queries"'
+        )
+        budget = settings.QUERY_BUDGETS.get(view_name)
+        if (budget is not None and len(queries) > budget
+                and settings.QUERY_BUDGET_STRICT):
+            raise QueryBudgetExceeded(
+                f'{view_name}: {len(queries)} запросов при бюджете {budget}'
+            )
+        return response
+
+
+class RangeFile:
+    """Файл, из которого читается только диапазон байтов.
+
+    `fileno()` и `tell()` позволяют WSGI-серверу отдать диапазон
+    через sendfile, остальные читают его блоками через `read()`.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """Первый байт и длина единственного диапазона из заголовка Range.
+
+    None — заголовка нет или он не поддерживается, и отдаётся весь
+    файл; ValueError — диапазон за пределами файла.
+    """
+    match = RANGE_RE.fullmatch(header.strip()) if header else None
+    if match is None or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end - start + 1
+
+
+def choose_file(request, path):
+    """Путь к сжатой копии, если браузер её принимает, и её кодировка."""
+    accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    for encoding, extension in PRECOMPRESSED:
+        if (re.search(rf'\b{encoding}\b', accepted)
+                and os.path.isfile(path + extension)):
+            return path + extension, encoding
+    return path, None
+
+
+def serve_file(request, path, immutable=False):
+    """Отдаёт файл с диска, поддерживая 304, Range и сжатые копии."""
+    range_header = request.META.get('HTTP_RANGE')
+    has_variants = any(os.path.isfile(path + extension)
+                       for _, extension in PRECOMPRESSED)
+    served_path, encoding = (
+        choose_file(request, path) if not range_header else (path, None)
+    )
+    stat = os.stat(served_path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{encoding or ""}"'
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if range_header and request.META.get('HTTP_IF_RANGE', etag) != etag:
+        range_header = None
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+    try:
+        byte_range = None if not_modified else parse_range(range_header,
+                                                           stat.st_size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+    if not_modified is not None:
+        response = not_modified
+    elif byte_range is None:
+        response = FileResponse(open(served_path, 'rb'),
+                                content_type=content_type)
+        response['Content-Length'] = stat.st_size
+    else:
+        start, length = byte_range
+        response = FileResponse(
+            RangeFile(open(served_path, 'rb'), start, length),
+            status=206, content_type=content_type,
+        )
+        response['Content-Length'] = length
+        response['Content-Range'] = (
+            f'bytes {start}-{start + length - 1}/{stat.st_size}'
+        )
+    if encoding:
+        response['Content-Encoding'] = encoding
+    if has_variants:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = (
+        f'public, max-age={IMMUTABLE_MAX_AGE}, immutable' if immutable
+        else f'public, max-age={settings.STATIC_FILES_MAX_AGE}'
+    )
+    return response
+
+
+class StaticFilesMiddleware:
+    """Раздаёт собранную статику (`STATIC_ROOT`) и загрузки (`MEDIA_ROOT`).
+
+    Файлы с хэшем в имени кэшируются браузером навсегда, остальные —
+    на `STATIC_FILES_MAX_AGE` секунд. Запрос до файла не доходит до
+    сессий и представлений, а тело отдаётся через `FileResponse`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.roots = [
+            (prefix, root, hashed)
+            for prefix, root, hashed in (
+                (settings.STATIC_URL, settings.STATIC_ROOT, True),
+                (settings.MEDIA_URL, settings.MEDIA_ROOT, False),
+            )
+            if prefix and root and prefix.startswith('/')
+        ]
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD'):
+            path = self.find_file(request.path_info)
+            if path is not None:
+                return serve_file(request, *path)
+        return self.get_response(request)
+
+    def find_file(self, url_path):
+        for prefix, root, hashed in self.roots:
+            if not url_path.startswith(prefix):
+                continue
+            try:
+                path = safe_join(root, unquote(url_path[len(prefix):]))
+            except SuspiciousFileOperation:
+                return None
+            if os.path.isfile(path):
+                return path, hashed and bool(HASHED_NAME_RE.search(path))
+        return None
@@ -0,0 +1,149 @@
+"""Кэш готовых страниц для анонимных посетителей.
+
+Каждая страница зависит от набора тегов. Ключ страницы включает
+текущие версии этих тегов, поэтому `purge_pages(tag)` делает
+недоступными только зависящие от тега страницы — остальной кэш
+остаётся на месте. Сброс внутри транзакции повторяется после её
+фиксации (`after_commit`).
+"""
+import asyncio
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import (get_conditional_response,
+                                patch_cache_control, patch_vary_headers,
+                                set_response_etag)
+from django.utils.translation import get_language
+
+PAGE_KEY_PREFIX = 'page'
+TAG_KEY_PREFIX = 'page_tag'
+
+
+def tag_key(tag):
+    return f'{TAG_KEY_PREFIX}:{tag}'
+
+
+def tag_versions(tags):
+    """Версии тегов; у вытесненного из кэша тега появляется новая.
+
+    Начальная версия — текущее время, чтобы тег, потерянный кэшем,
+    не вернул к жизни страницы со старой версией.
+    """
+    keys = [tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def after_commit(func):
+    """Вызывает `func` сейчас и ещё раз после фиксации транзакции.
+
+    Запрос, пришедший между сбросом кэша и COMMIT, читает ещё старые
+    строки и сохранил бы их под новой версией на всё время жизни
+    кэша; повторный вызов после COMMIT делает такую запись недоступной.
+    """
+    func()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(func)
+
+
+def purge_pages(*tags):
+    """Сбрасывает закэшированные страницы, зависящие от `tags`."""
+    def purge():
+        version = time.time_ns()
+        cache.set_many({tag_key(tag): version for tag in tags}, None)
+    after_commit(purge)
+
+
+def page_cache_key(request, tags):
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    versions = tag_versions(tags)
+    raw = '|'.join([request.get_host(), request.path, query,
+                    get_language() or '', *map(str, versions)])
+    return f'{PAGE_KEY_PREFIX}:{hashlib.md5(raw.encode()).hexdigest()}'
+
+
+def is_cacheable(response):
+    cache_control = response.get('Cache-Control', '')
+    return (response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and 'private' not in cache_control
+            and 'no-store' not in cache_control)
+
+
+def cached_response(request, tags, kwargs):
+    """Ключ страницы и её ответ из кэша; ключ None — кэш не применяется."""
+    if (request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated
+            or not settings.PAGE_CACHE_TIMEOUT):
+        return None, None
+    key = page_cache_key(request, [tag.format(**kwargs) for tag in tags])
+    return key, cache.get(key)
+
+
+def store_response(request, key, response):
+    if callable(getattr(response, 'render', None)):
+        response.render()
+    if not is_cacheable(response):
+        return response
+    if not response.has_header('ETag'):
+        set_response_etag(response)
+    patch_cache_control(response, public=True, max_age=0)
+    patch_vary_headers(response, ('Cookie', 'Accept-Language'))
+    cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+    return conditional_response(request, response)
+
+
+def conditional_response(request, response):
+    return get_conditional_response(
+        request, etag=response['ETag'], response=response
+    )
+
+
+def cache_anonymous_page(*tags):
+    """Отдаёт анонимным посетителям страницу из кэша.
+
+    Теги могут ссылаться на аргументы представления:
+    `cache_anonymous_page('category:{category_slug}')`. Страница
+    хранится `PAGE_CACHE_TIMEOUT` секунд или до сброса одного из
+    тегов; браузеру она отдаётся с ETag и перепроверяется при
+    каждом открытии. Подходит и для асинхронных представлений.
+    """
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                key, response = await sync_to_async(cached_response)(
+                    request, tags, kwargs
+                )
+                if response is not None:
+                    return conditional_response(request, response)
+                response = await view(request, *args, **kwargs)
+                if key is None:
+                    return response
+                return await sync_to_async(store_response)(
+                    request, key, response
+                )
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key, response = cached_response(request, tags, kwargs)
+            if response is not None:
+                return conditional_response(request, response)
+            response = view(request, *args, **kwargs)
+            if key is None:
+                return response
+            return store_response(request, key, response)
+        return wrapper
+    return decorator
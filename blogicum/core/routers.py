@@ -0,0 +1,26 @@
+from django.db import connections
+
+READ_ALIAS = 'replica'
+WRITE_ALIAS = 'default'
+
+
+class ReadReplicaRouter:
+    """Чтение — через отдельное соединение только для чтения.
+
+    Внутри транзакции чтение идёт в основное соединение, чтобы видеть
+    ещё не зафиксированные изменения этой же транзакции.
+    """
+
+    def db_for_read(self, model, **hints):
+        if connections[WRITE_ALIAS].in_atomic_block:
+            return WRITE_ALIAS
+        return READ_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return WRITE_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == WRITE_ALIAS
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+# Меняют сам файл базы — соединению только для чтения они недоступны.
+WRITE_PRAGMAS = {'journal_mode'}
+
+
+def is_read_only(connection):
+    """Открыто ли соединение SQLite в режиме `mode=ro`."""
+    settings_dict = connection.settings_dict
+    return (settings_dict.get('OPTIONS', {}).get('uri', False)
+            and 'mode=ro' in str(settings_dict['NAME']))
+
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    """Применяет `SQLITE_PRAGMAS` к каждому новому соединению SQLite.
+
+    Соединение только для чтения пропускает `WRITE_PRAGMAS`: файл в
+    WAL переводит основное соединение.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    read_only = is_read_only(connection)
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            if read_only and pragma in WRITE_PRAGMAS:
+                continue
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    """Закрывает оборвавшиеся постоянные соединения до начала запроса.
+
+    Аналог `CONN_HEALTH_CHECKS` из Django 4.1: без проверки первый
+    запрос после перезапуска СУБД падал бы на мёртвом соединении.
+    """
+    for connection in connections.all():
+        if (connection.connection is None
+                or connection.in_atomic_block
+                or not connection.settings_dict.get('CONN_HEALTH_CHECKS')):
+            continue
+        if not connection.is_usable():
+            connection.close()
@@ -0,0 +1,51 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.txt', '.html', '.json', '.xml', '.map',
+    '.ico',
+)
+MIN_COMPRESS_SIZE = 256
+
+
+def compressed_variants(content):
+    """Сжатые копии `content`: расширение → байты, только если меньше."""
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content)
+    return {extension: data for extension, data in variants.items()
+            if len(data) < len(content)}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэшированные имена файлов и заранее сжатые копии рядом с ними.
+
+    `collectstatic` кладёт `name.<hash>.css.gz` (и `.br`, если
+    установлен пакет brotli), а core.middleware.StaticFilesMiddleware
+    отдаёт их браузерам, которые принимают такое сжатие.
+    """
+
+    def post_process(self, *args, **kwargs):
+        yield from super().post_process(*args, **kwargs)
+        if not kwargs.get('dry_run'):
+            for hashed_name in set(self.hashed_files.values()):
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        for extension, data in compressed_variants(content).items():
+            if self.exists(name + extension):
+                self.delete(name + extension)
+            self._save(name + extension, ContentFile(data))
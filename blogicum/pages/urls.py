@@ -7,4 +7,5 @@ app_name = 'pages'
 urlpatterns = [
     path('about/', views.About.as_view(), name='about'),
     path('rules/', views.Rules.as_view(), name='rules'),
+    path('queries/', views.QueryStats.as_view(), name='queries'),
 ]
@@ -1,18 +1,37 @@
 
 from http import HTTPStatus
 
+from django.contrib.auth.mixins import UserPassesTestMixin
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
 
+from core.middleware import get_query_stats
+from core.page_cache import cache_anonymous_page
 
+
+@method_decorator(cache_anonymous_page('pages'), name='dispatch')
 class About(TemplateView):
     template_name = 'pages/about.html'
 
 
+@method_decorator(cache_anonymous_page('pages'), name='dispatch')
 class Rules(TemplateView):
     template_name = 'pages/rules.html'
 
 
+class QueryStats(UserPassesTestMixin, TemplateView):
+    template_name = 'pages/queries.html'
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['view_stats'] = get_query_stats()
+        return context
+
+
 def page_not_found(request, exception):
     return render(request, 'pages/404.html',
                   status=HTTPStatus.NOT_FOUND)
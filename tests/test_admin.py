@@ -0,0 +1,193 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def admin_client(mixer):
+    client = Client()
+    client.force_login(mixer.blend("auth.User", is_staff=True,
+                                   is_superuser=True))
+    return client
+
+
+def changelist_queries(client, url):
+    client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries.captured_queries), response
+
+
+@pytest.mark.parametrize("url", ["/admin/blog/post/", "/admin/blog/comment/"])
+def test_changelist_queries_do_not_grow(
+        mixer, admin_client, url, post_with_published_location,
+        published_locations
+):
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    few, _ = changelist_queries(admin_client, url)
+
+    post = post_with_published_location
+    posts = mixer.cycle(10).blend(
+        "blog.Post", author__username=mixer.sequence("author{0}"),
+        category=post.category, location=mixer.sequence(*published_locations),
+    )
+    mixer.cycle(10).blend("blog.Comment", post=mixer.sequence(*posts),
+                          author=mixer.sequence(*(p.author for p in posts)))
+    many, response = changelist_queries(admin_client, url)
+    assert many == few, (
+        f"Убедитесь, что число запросов списка `{url}` не зависит от числа"
+        " строк."
+    )
+    assert response.context["cl"].result_count == 11
+
+
+def test_changelist_loads_text_preview(
+        mixer, admin_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.text = "слово " * 100
+    post.save()
+    _, response = changelist_queries(admin_client, "/admin/blog/post/")
+    row = response.context["cl"].result_list[0]
+    assert "text" in row.get_deferred_fields(), (
+        "Убедитесь, что список постов в админке не загружает полный текст."
+    )
+    assert len(row.text_preview) == 80
+
+
+def test_estimated_count_for_large_tables(
+        mixer, post_with_published_location
+):
+    from blog.models import Post
+    from blog.paginators import EstimatedCountPaginator
+
+    mixer.cycle(3).blend("blog.Post",
+                         category=post_with_published_location.category)
+    Post.objects.filter(pk=post_with_published_location.pk).delete()
+    paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+    assert paginator.count == 3
+
+    paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+    paginator.exact_count_limit = 0
+    with CaptureQueriesContext(connection) as queries:
+        estimate = paginator.count
+    assert estimate >= 3
+    assert "COUNT(" not in queries.captured_queries[0]["sql"], (
+        "Убедитесь, что для большой таблицы число строк оценивается,"
+        " а не считается."
+    )
+
+    filtered = EstimatedCountPaginator(
+        Post.objects.filter(is_published=False), 10
+    )
+    filtered.exact_count_limit = 0
+    assert filtered.count == Post.objects.filter(is_published=False).count()
+
+
+def test_list_editable_saves_with_deferred_text(
+        admin_client, post_with_published_location, published_locations
+):
+    post = post_with_published_location
+    location = published_locations[-1]
+    response = admin_client.post("/admin/blog/post/", {
+        "form-TOTAL_FORMS": 1,
+        "form-INITIAL_FORMS": 1,
+        "form-0-id": post.id,
+        "form-0-category": post.category_id,
+        "form-0-location": location.id,
+        "form-0-is_published": "on",
+        "_save": "Сохранить",
+    })
+    assert response.status_code == 302
+    text = post.text
+    post.refresh_from_db()
+    assert (post.location_id, post.text) == (location.id, text), (
+        "Убедитесь, что правка в списке постов сохраняет выбранную"
+        " локацию и не затирает текст."
+    )
+
+
+@pytest.mark.parametrize("model, field", [
+    ("category", "category"), ("location", "location"),
+])
+def test_change_page_summarizes_posts(
+        mixer, admin_client, model, field, post_with_published_location
+):
+    target = getattr(post_with_published_location, field)
+    url = f"/admin/blog/{model}/{target.id}/change/"
+    few, _ = changelist_queries(admin_client, url)
+    mixer.cycle(15).blend(
+        "blog.Post", category=post_with_published_location.category,
+        location=post_with_published_location.location,
+    )
+    many, response = changelist_queries(admin_client, url)
+    assert many == few, (
+        "Убедитесь, что страница категории и локации в админке не"
+        " загружает посты по одному."
+    )
+    content = response.content.decode("utf-8")
+    assert "Всего: 16" in content
+    assert f"?{field}__id__exact={target.id}" in content, (
+        "Убедитесь, что на странице есть ссылка на отфильтрованный"
+        " список постов."
+    )
+    assert 'name="category_posts-' not in content
+    assert admin_client.get(
+        f"/admin/blog/post/?{field}__id__exact={target.id}"
+    ).status_code == 200
+
+
+def test_comment_search(mixer, admin_client, post_with_published_location):
+    post = post_with_published_location
+    post.title = "Осенний лес"
+    post.save()
+    by_author = mixer.blend("blog.Comment", author__username="moderator",
+                            text="Обычный текст")
+    on_post = mixer.blend("blog.Comment", post=post, text="Обычный текст")
+    by_text = mixer.blend("blog.Comment", text="Редкое СЛОВО в тексте")
+
+    def found(query):
+        response = admin_client.get("/admin/blog/comment/", {"q": query})
+        assert response.status_code == 200
+        return set(response.context["cl"].result_list)
+
+    assert found("moderator") == {by_author}, (
+        "Убедитесь, что комментарии ищутся по точному имени автора."
+    )
+    assert found("moder") == set()
+    assert found("Осенний") == {on_post}, (
+        "Убедитесь, что комментарии ищутся по началу заголовка поста."
+    )
+    assert found("слово") == {by_text}, (
+        "Убедитесь, что комментарии ищутся по тексту."
+    )
+
+    by_text.text = "Другой текст"
+    by_text.save()
+    assert found("слово") == set()
+    response = admin_client.get("/admin/blog/comment/", {
+        "created_at__year": by_text.created_at.year,
+    })
+    assert response.status_code == 200
+
+
+def test_editable_lookups_render_selected_option_only(
+        mixer, admin_client, post_with_published_location,
+        published_locations
+):
+    post = post_with_published_location
+    mixer.cycle(20).blend("blog.Category", is_published=True)
+    mixer.cycle(20).blend("blog.Location", is_published=True)
+    mixer.cycle(4).blend("blog.Post", category=post.category,
+                         location=mixer.sequence(*published_locations))
+    _, response = changelist_queries(admin_client, "/admin/blog/post/")
+    rows = response.context["cl"].result_count
+    options = response.content.decode().count("<option")
+    assert options <= rows * 4 + 10, (
+        "Убедитесь, что категория и локация в списке постов выбираются"
+        " автодополнением, а не полным списком в каждой строке."
+    )
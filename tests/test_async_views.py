@@ -0,0 +1,67 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, override_settings
+
+from conftest import N_PER_PAGE
+
+
+def call(view, user, url, **kwargs):
+    request = RequestFactory().get(url)
+    request.user = user
+    return async_to_sync(view)(request, **kwargs)
+
+
+@pytest.mark.django_db
+@override_settings(ASYNC_VIEWS_PARALLEL_DB=False)
+def test_async_feed_pages(user, many_posts_with_published_locations):
+    from blog import async_views
+
+    post = many_posts_with_published_locations[0]
+    pages = (
+        (async_views.index, "/", {}),
+        (async_views.category_post, "/category/",
+         {"category_slug": post.category.slug}),
+        (async_views.profile, "/profile/",
+         {"username": post.author.username}),
+    )
+    for view, url, kwargs in pages:
+        response = call(view, AnonymousUser(), url, **kwargs)
+        assert response.status_code == 200
+        assert response.content.decode().count('class="card') >= N_PER_PAGE, (
+            f"Убедитесь, что асинхронная версия страницы `{url}` выводит"
+            " страницу постов."
+        )
+    last_page = call(async_views.index, user, "/?page=999")
+    assert last_page.status_code == 200
+
+
+@pytest.mark.django_db
+@override_settings(ASYNC_VIEWS_PARALLEL_DB=False)
+def test_async_post_detail(mixer, user, post_with_published_location):
+    from blog import async_views
+
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post, text="Асинхронный комментарий")
+    response = call(async_views.post_detail, user, "/posts/", post_id=post.id)
+    assert "Асинхронный комментарий" in response.content.decode()
+    assert response.has_header("ETag")
+
+    anonymous = call(async_views.post_detail, AnonymousUser(), "/posts/",
+                     post_id=post.id)
+    assert anonymous.status_code == 302
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_views_query_in_parallel_threads(
+        user, post_with_published_location
+):
+    from blog import async_views
+
+    post = post_with_published_location
+    response = call(async_views.category_post, user, "/category/",
+                    category_slug=post.category.slug)
+    assert post.title in response.content.decode(), (
+        "Убедитесь, что асинхронные страницы работают, когда запросы к БД"
+        " выполняются из разных потоков."
+    )
@@ -0,0 +1,116 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_stats(user):
+    from blog.models import AuthorStats
+
+    return AuthorStats.objects.get(user=user)
+
+
+def test_stats_follow_posts_and_comments(
+        user, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    stats = get_stats(user)
+    assert (stats.post_count, stats.published_count) == (1, 1), (
+        "Убедитесь, что при создании публикации обновляется сводка автора."
+    )
+    assert stats.last_post_at == post.created_at
+
+    post.is_published = False
+    post.save()
+    assert get_stats(user).published_count == 0, (
+        "Убедитесь, что снятие публикации уменьшает число опубликованных"
+        " постов в сводке автора."
+    )
+
+    url = f"/posts/{post.id}/comment/"
+    user_client.post(url, data={"text": "Первый"})
+    user_client.post(url, data={"text": "Второй"})
+    assert get_stats(user).comment_count == 2, (
+        "Убедитесь, что комментарии учитываются в сводке автора."
+    )
+    comment = post.post.first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert get_stats(user).comment_count == 1
+
+    post.delete()
+    stats = get_stats(user)
+    assert (stats.post_count, stats.last_post_at) == (0, None), (
+        "Убедитесь, что удаление публикации обновляет сводку автора."
+    )
+
+
+def test_profile_does_not_count_posts(
+        user, another_user_client, post_with_published_location
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = another_user_client.get(f"/profile/{user.username}/")
+    assert response.status_code == 200
+    assert response.context["stats"].post_count == 1
+    counting = [query["sql"] for query in queries.captured_queries
+                if "COUNT(" in query["sql"] and "blog_post" in query["sql"]]
+    assert not counting, (
+        "Убедитесь, что страница профиля берёт число постов из сводки"
+        " автора, а не считает их."
+    )
+    user_rows = [query["sql"] for query in queries.captured_queries
+                 if 'FROM "auth_user"' in query["sql"]
+                 and '"auth_user"."password"' in query["sql"]
+                 and f"'{user.username}'" in query["sql"]]
+    assert not user_rows, (
+        "Убедитесь, что профиль не загружает строку автора целиком."
+    )
+
+
+def test_recount_rebuilds_author_stats(
+        mixer, user, post_with_published_location
+):
+    from blog.models import AuthorStats
+
+    mixer.cycle(3).blend("blog.Comment", post=post_with_published_location,
+                         author=user)
+    AuthorStats.objects.all().delete()
+
+    call_command("recount_comments")
+    stats = get_stats(user)
+    assert (stats.post_count, stats.published_count,
+            stats.comment_count) == (1, 1, 3), (
+        "Убедитесь, что команда `recount_comments` пересчитывает сводки"
+        " авторов."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_deleting_author_with_posts_and_comments(
+        mixer, user, another_user, post_with_published_location
+):
+    from blog.models import AuthorStats, Comment
+
+    mixer.blend("blog.Comment", post=post_with_published_location,
+                author=user)
+    mixer.blend("blog.Comment", post=post_with_published_location,
+                author=another_user)
+    user.delete()
+
+    assert not AuthorStats.objects.filter(user_id=user.id).exists(), (
+        "Убедитесь, что удаление автора не создаёт заново его сводку."
+    )
+    assert not Comment.objects.exists()
+    assert get_stats(another_user).comment_count == 0
+
+
+def test_bump_does_not_create_row_for_decrement(user):
+    from blog.models import AuthorStats
+
+    AuthorStats.objects.filter(user=user).delete()
+    AuthorStats.objects.bump(user.id, comment_count=-1)
+    assert not AuthorStats.objects.filter(user=user).exists()
+    AuthorStats.objects.bump(user.id, comment_count=1)
+    AuthorStats.objects.bump(user.id, comment_count=1)
+    assert get_stats(user).comment_count == 2
@@ -0,0 +1,56 @@
+import pytest
+from django.core.cache import cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_feed_uses_cached_cards(user_client, post_with_published_location):
+    from blog.cards import card_key
+
+    cache.set(card_key(post_with_published_location), "<p>из кэша</p>")
+    content = user_client.get("/").content.decode("utf-8")
+    assert "<p>из кэша</p>" in content, (
+        "Убедитесь, что лента собирается из закэшированных карточек постов."
+    )
+
+
+@pytest.mark.parametrize("related", ("category", "location"))
+def test_related_change_invalidates_card(
+        related, user_client, post_with_published_location
+):
+    user_client.get("/")
+    obj = getattr(post_with_published_location, related)
+    field = "title" if related == "category" else "name"
+    setattr(obj, field, "Новое название")
+    obj.save()
+    content = user_client.get("/").content.decode("utf-8")
+    assert "Новое название" in content, (
+        f"Убедитесь, что при изменении объекта `{related}` карточки"
+        " связанных постов рендерятся заново."
+    )
+
+
+def test_comment_invalidates_card(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Текст"})
+    content = user_client.get("/").content.decode("utf-8")
+    assert "Комментарии (1)" in content, (
+        "Убедитесь, что после добавления комментария карточка поста"
+        " показывает новое число комментариев."
+    )
+
+
+def test_card_follows_author_rename(
+        user, client, post_with_published_location
+):
+    client.get("/")
+    user.username = "renamed_author"
+    user.save()
+    content = client.get("/").content.decode("utf-8")
+    assert "/profile/renamed_author/" in content, (
+        "Убедитесь, что после смены имени автора карточки его постов"
+        " показывают новое имя."
+    )
@@ -0,0 +1,64 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_counter_follows_views(
+        user, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/comment/"
+    user_client.post(url, data={"text": "Первый"})
+    user_client.post(url, data={"text": "Второй"})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при добавлении комментария увеличивается счётчик"
+        " комментариев публикации."
+    )
+
+    comment = post.post.first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что при удалении комментария уменьшается счётчик"
+        " комментариев публикации."
+    )
+
+
+def test_recount_comments_repairs_counters(
+        mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+
+    call_command("recount_comments")
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что команда `recount_comments` пересчитывает счётчики"
+        " комментариев."
+    )
+
+
+def test_comment_counter_follows_any_delete(
+        mixer, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    mixer.blend("blog.Comment", post=post, author=another_user)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что счётчик комментариев учитывает комментарии,"
+        " созданные не через представление."
+    )
+
+    Comment.objects.filter(pk=post.post.first().pk).delete()
+    another_user.delete()
+    post.refresh_from_db()
+    assert post.comment_count == post.post.count() == 1, (
+        "Убедитесь, что счётчик комментариев уменьшается при удалении"
+        " комментария из админки и вместе с его автором."
+    )
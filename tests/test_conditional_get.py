@@ -0,0 +1,94 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def revalidate(client, url, etag):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    return response, ctx.captured_queries
+
+
+def test_post_detail_not_modified(
+        mixer: Mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    first = user_client.get(url)
+    assert first.has_header("ETag") and first.has_header("Last-Modified")
+
+    response, queries = revalidate(user_client, url, first["ETag"])
+    assert response.status_code == 304, (
+        "Убедитесь, что страница поста отвечает 304 на запрос с"
+        " актуальным `If-None-Match`."
+    )
+    assert not response.templates
+    assert not any('FROM "blog_comment"' in query["sql"]
+                   for query in queries), (
+        "Убедитесь, что при ответе 304 комментарии не загружаются."
+    )
+
+    mixer.blend("blog.Comment", post=post)
+    response, _ = revalidate(user_client, url, first["ETag"])
+    assert response.status_code == 200, (
+        "Убедитесь, что новый комментарий меняет ETag страницы поста."
+    )
+
+
+@pytest.mark.parametrize(
+    "url", ("/", "/category/{slug}/", "/profile/{username}/")
+)
+def test_feed_not_modified_until_post_changes(
+        url, user, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = url.format(slug=post.category.slug, username=user.username)
+    etag = user_client.get(url)["ETag"]
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    post.title = "Новый заголовок"
+    post.save()
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        f"Убедитесь, что изменение поста меняет ETag страницы `{url}`."
+    )
+
+
+def test_etag_depends_on_user(
+        user, user_client, another_user_client, post_with_published_location
+):
+    url = f"/profile/{user.username}/"
+    own_etag = user_client.get(url)["ETag"]
+    assert own_etag != another_user_client.get(url)["ETag"], (
+        "Убедитесь, что ETag учитывает пользователя: автор видит на"
+        " своей странице кнопки, которых нет у других."
+    )
+
+
+@pytest.mark.parametrize("url", ("/", "/category/{slug}/"))
+@pytest.mark.parametrize("change", ("delete", "unpublish"))
+def test_feed_revalidates_after_post_removed(
+        url, change, mixer: Mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend("blog.Post", author=post.author, category=post.category,
+                is_published=True, pub_date=post.pub_date)
+    url = url.format(slug=post.category.slug)
+    first = user_client.get(url)
+    assert not first.has_header("Last-Modified"), (
+        f"Убедитесь, что страница `{url}` не отдаёт Last-Modified: дата"
+        " изменения постов не меняется при удалении поста из ленты."
+    )
+
+    if change == "delete":
+        post.delete()
+    else:
+        post.is_published = False
+        post.save()
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert response.status_code == 200, (
+        f"Убедитесь, что пост, пропавший из ленты, меняет ETag страницы"
+        f" `{url}`."
+    )
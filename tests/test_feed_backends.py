@@ -0,0 +1,119 @@
+import os
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+PER_PAGE = 2
+
+
+@pytest.fixture
+def feed_data(mixer, user, another_user):
+    now = timezone.now().replace(microsecond=0)
+    published = mixer.blend("blog.Category", is_published=True)
+    hidden = mixer.blend("blog.Category", is_published=False)
+    tie = now - timedelta(days=3)
+    rows = [
+        # (автор, категория, pub_date, is_published)
+        (user, published, now - timedelta(days=1), True),
+        (user, published, tie, True),
+        (another_user, published, tie, True),
+        (another_user, published, now - timedelta(days=5), False),
+        (user, hidden, now - timedelta(days=2), True),
+        (another_user, published, now + timedelta(days=1), True),
+        (user, published, tie, True),
+    ]
+    posts = [
+        mixer.blend("blog.Post", author=author, category=category,
+                    pub_date=pub_date, is_published=is_published)
+        for author, category, pub_date, is_published in rows
+    ]
+    return now, published, posts
+
+
+def feed_order(posts):
+    return [post.id for post in
+            sorted(posts, key=lambda post: (post.pub_date, post.id),
+                   reverse=True)]
+
+
+def expected_feeds(now, category, posts, user):
+    public = [post for post in posts
+              if post.is_published and post.category.is_published
+              and post.pub_date <= now]
+    return {
+        "index": feed_order(public),
+        "category": feed_order(
+            [post for post in public if post.category_id == category.id]
+        ),
+        "profile": feed_order(
+            [post for post in posts if post.author_id == user.id]
+        ),
+        "visible_to": feed_order(
+            [post for post in posts
+             if post in public or post.author_id == user.id]
+        ),
+        "count": len(public),
+    }
+
+
+def actual_feeds(now, category, user):
+    from blog.models import Post
+    from blog.querysets import displayed_posts, limited_access_posts
+
+    public = displayed_posts(limited_access_posts(now))
+    return {
+        "index": [post.id for post in public],
+        "category": [post.id for post in
+                     public.filter(category_id=category.id)],
+        "profile": [post.id for post in
+                    displayed_posts().filter(author_id=user.id)],
+        "visible_to": [post.id for post in
+                       displayed_posts(Post.objects.visible_to(user, now))],
+        "count": public.count(),
+    }
+
+
+def cursor_walk(queryset):
+    from blog.paginators import CursorPaginator
+
+    paginator = CursorPaginator(queryset, PER_PAGE)
+    page = paginator.page()
+    ids = [post.id for post in page]
+    while page.has_next():
+        page = paginator.page(page.next_cursor)
+        ids.extend(post.id for post in page)
+    return ids
+
+
+def assert_feeds_match(feed_data, user):
+    from blog.querysets import displayed_posts, limited_access_posts
+
+    now, category, posts = feed_data
+    expected = expected_feeds(now, category, posts, user)
+    assert actual_feeds(now, category, user) == expected, (
+        f"Убедитесь, что ленты на `{connection.vendor}` совпадают с"
+        " эталоном."
+    )
+    walked = cursor_walk(displayed_posts(limited_access_posts(now)))
+    assert walked == expected["index"], (
+        f"Убедитесь, что курсорная пагинация на `{connection.vendor}`"
+        " обходит ленту в том же порядке."
+    )
+
+
+def test_feeds_match_reference(feed_data, user):
+    assert_feeds_match(feed_data, user)
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql"
+    or not os.environ.get("DATABASE_URL", "").startswith("postgres"),
+    reason="Нужен DATABASE_URL с PostgreSQL",
+)
+def test_feeds_match_reference_on_postgresql(feed_data, user):
+    assert connection.vendor == "postgresql"
+    assert_feeds_match(feed_data, user)
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(FEED_TIME_BUCKET=60)
+def test_feed_now_is_bucketed():
+    from blog.querysets import feed_now
+
+    now = feed_now()
+    assert now <= timezone.now()
+    assert now.timestamp() % 60 == 0, (
+        "Убедитесь, что граница публикации в лентах округляется до"
+        " `FEED_TIME_BUCKET` секунд."
+    )
+
+
+def test_scheduled_post_appears_without_restart(
+        monkeypatch, mixer, user, user_client, published_category
+):
+    real_now = timezone.now()
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=real_now + timedelta(minutes=5),
+    )
+    assert post not in user_client.get("/").context["page_obj"]
+
+    monkeypatch.setattr(
+        timezone, "now", lambda: real_now + timedelta(minutes=10)
+    )
+    assert post in user_client.get("/").context["page_obj"], (
+        "Убедитесь, что отложенная публикация появляется в ленте, когда"
+        " наступает её время, без перезапуска сервера."
+    )
+
+
+def test_feed_page_is_served_from_cache(
+        user_client, many_posts_with_published_locations,
+        django_assert_max_num_queries
+):
+    user_client.get("/")
+    with django_assert_max_num_queries(2):
+        response = user_client.get("/")
+    assert len(response.context["page_obj"]) > 0, (
+        "Убедитесь, что повторный запрос ленты в том же интервале времени"
+        " отдаётся из кэша."
+    )
@@ -0,0 +1,64 @@
+import pytest
+from django.db import connection
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="План запроса SQLite"
+    ),
+]
+
+
+def assert_uses_index(queryset, table, index_name):
+    plan = queryset.explain()
+    table_steps = [
+        line for line in plan.splitlines() if f" {table} " in f"{line} "
+    ]
+    assert table_steps, plan
+    for step in table_steps:
+        assert "SCAN" not in step or "USING" in step, (
+            f"Запрос читает таблицу `{table}` полным перебором:\n{plan}"
+        )
+    assert f"USING INDEX {index_name}" in plan, (
+        f"Убедитесь, что запрос использует индекс `{index_name}`:\n{plan}"
+    )
+
+
+def test_published_feed_uses_index():
+    from blog.querysets import displayed_posts, limited_access_posts
+
+    assert_uses_index(
+        displayed_posts(limited_access_posts()),
+        "blog_post",
+        "post_published_feed_idx",
+    )
+
+
+def test_category_feed_uses_index():
+    from blog.querysets import displayed_posts, limited_access_posts
+
+    assert_uses_index(
+        displayed_posts(limited_access_posts()).filter(category_id=1),
+        "blog_post",
+        "post_category_feed_idx",
+    )
+
+
+def test_author_feed_uses_index():
+    from blog.querysets import displayed_posts
+
+    assert_uses_index(
+        displayed_posts().filter(author_id=1),
+        "blog_post",
+        "post_author_feed_idx",
+    )
+
+
+def test_post_comments_use_index():
+    from blog.models import Comment
+
+    assert_uses_index(
+        Comment.objects.filter(post_id=1),
+        "blog_comment",
+        "comment_post_created_idx",
+    )
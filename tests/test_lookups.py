@@ -0,0 +1,102 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def captured_sql(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [query["sql"] for query in ctx.captured_queries]
+
+
+def test_feed_does_not_join_lookup_tables(
+        user_client, many_posts_with_published_locations
+):
+    post_selects = [
+        sql for sql in captured_sql(user_client, "/")
+        if sql.startswith("SELECT") and 'FROM "blog_post"' in sql
+        and "LIMIT" in sql
+    ]
+    assert post_selects
+    assert all('"blog_location"' not in sql for sql in post_selects), (
+        "Убедитесь, что лента берёт локации из справочника, а не"
+        " соединяет таблицу локаций в запросе."
+    )
+
+
+def test_post_form_choices_from_lookups(
+        user_client, published_category, published_location
+):
+    queries = captured_sql(user_client, "/posts/create/")
+    assert not any(
+        'FROM "blog_category"' in sql or 'FROM "blog_location"' in sql
+        for sql in queries
+    ), (
+        "Убедитесь, что варианты категорий и локаций в форме поста"
+        " берутся из справочников."
+    )
+    content = user_client.get("/posts/create/").content.decode()
+    assert published_category.title in content
+    assert published_location.name in content
+
+
+def test_lookup_refreshed_on_save(published_category):
+    from blog.lookups import categories
+
+    assert categories.get_by_slug(published_category.slug).title == (
+        published_category.title
+    )
+    published_category.title = "Новое название"
+    published_category.save()
+    assert categories.get(published_category.pk).title == "Новое название", (
+        "Убедитесь, что справочник категорий обновляется при сохранении"
+        " категории."
+    )
+    published_category.delete()
+    assert categories.get_by_slug(published_category.slug) is None
+
+
+def test_attach_lookups_reads_versions_once(
+        many_posts_with_published_locations
+):
+    from unittest import mock
+
+    from django.core.cache import cache
+
+    from blog.lookups import attach_lookups
+    from blog.models import Post
+
+    posts = list(Post.objects.all()[:10])
+    attach_lookups(posts[:1])
+    with mock.patch.object(cache, "get", wraps=cache.get) as cache_get:
+        attach_lookups(posts)
+    assert cache_get.call_count == 2, (
+        "Убедитесь, что справочники читают версию из кэша один раз на"
+        " страницу, а не на каждый пост."
+    )
+
+
+def test_lookup_version_expires(published_category):
+    from unittest import mock
+
+    from django.core.cache import cache
+
+    from blog.lookups import categories
+    from blog.models import Category
+    from core.canstants import LOOKUP_VERSION_TIMEOUT
+
+    with mock.patch.object(cache, "set", wraps=cache.set) as cache_set:
+        categories.refresh()
+    assert mock.call(categories.version_key, mock.ANY,
+                     LOOKUP_VERSION_TIMEOUT) in cache_set.call_args_list, (
+        "Убедитесь, что версия справочника хранится ограниченное время."
+    )
+
+    Category.objects.filter(pk=published_category.pk).update(
+        is_published=False)
+    assert categories.get(published_category.pk).is_published
+    cache.delete(categories.version_key)
+    assert not categories.get(published_category.pk).is_published
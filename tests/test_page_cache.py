@@ -0,0 +1,102 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url, **headers):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, **headers)
+    return response, len(ctx.captured_queries)
+
+
+@pytest.mark.parametrize("url", ("/", "/pages/about/", "/pages/rules/"))
+def test_anonymous_page_served_from_cache(
+        url, client, post_with_published_location
+):
+    first, _ = count_queries(client, url)
+    assert first.status_code == 200
+    second, n_queries = count_queries(client, url)
+    assert n_queries == 0, (
+        f"Убедитесь, что страница `{url}` отдаётся анонимным посетителям"
+        " из кэша без запросов к БД."
+    )
+    assert second.content == first.content
+    assert "public" in second["Cache-Control"]
+    not_modified, _ = count_queries(
+        client, url, HTTP_IF_NONE_MATCH=second["ETag"]
+    )
+    assert not_modified.status_code == 304
+
+
+def test_page_param_varies_cache(client, many_posts_with_published_locations):
+    first = client.get("/").content
+    assert client.get("/?page=2").content != first
+
+
+def test_logged_in_user_bypasses_cache(
+        user_client, post_with_published_location
+):
+    user_client.get("/")
+    _, n_queries = count_queries(user_client, "/")
+    assert n_queries > 0
+
+
+def test_post_change_purges_only_dependent_pages(
+        mixer: Mixer, client, user, published_category, another_category,
+        published_location
+):
+    category_url = f"/category/{published_category.slug}/"
+    other_url = f"/category/{another_category.slug}/"
+    for url in ("/", category_url, other_url):
+        client.get(url)
+
+    mixer.blend(
+        "blog.Post",
+        title="Свежий пост",
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+    for url in ("/", category_url):
+        assert "Свежий пост" in client.get(url).content.decode(), (
+            f"Убедитесь, что кэш страницы `{url}` сбрасывается при"
+            " публикации поста."
+        )
+    _, n_queries = count_queries(client, other_url)
+    assert n_queries == 0, (
+        "Убедитесь, что изменение поста не сбрасывает кэш страниц"
+        " других категорий."
+    )
+
+
+def test_comment_purges_feed(
+        mixer: Mixer, client, post_with_published_location
+):
+    client.get("/")
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    _, n_queries = count_queries(client, "/")
+    assert n_queries > 0, (
+        "Убедитесь, что новый комментарий сбрасывает кэш ленты."
+    )
+
+
+def test_purge_repeats_after_commit(
+        client, django_capture_on_commit_callbacks,
+        post_with_published_location
+):
+    post = post_with_published_location
+    with django_capture_on_commit_callbacks(execute=True):
+        post.title = "Новый заголовок"
+        post.save()
+        client.get("/")
+        _, n_queries = count_queries(client, "/")
+        assert n_queries == 0
+    _, n_queries = count_queries(client, "/")
+    assert n_queries > 0, (
+        "Убедитесь, что кэш ленты сбрасывается ещё раз после COMMIT:"
+        " страница, закэшированная до фиксации транзакции, могла"
+        " сохранить старые данные."
+    )
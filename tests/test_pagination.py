@@ -0,0 +1,59 @@
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def collect_pages(client, url):
+    seen, cursor_url = [], url
+    for _ in range(N_PER_PAGE):
+        page_obj = client.get(cursor_url).context["page_obj"]
+        seen.extend(post.id for post in page_obj)
+        if not page_obj.has_next():
+            return seen, page_obj
+        cursor_url = f"{url}?cursor={page_obj.next_cursor}"
+    raise AssertionError("Курсорная пагинация не доходит до конца ленты.")
+
+
+@override_settings(CURSOR_PAGINATION=True)
+@pytest.mark.parametrize("url", ("/", "/profile/{username}/"))
+def test_cursor_walks_whole_feed(
+        url, user, user_client, many_posts_with_published_locations
+):
+    url = url.format(username=user.username)
+    seen, last_page = collect_pages(user_client, url)
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True,
+    )
+    assert seen == [post.id for post in expected], (
+        "Убедитесь, что курсорная пагинация выдаёт каждый пост ровно один"
+        " раз и в порядке убывания даты публикации."
+    )
+    previous = user_client.get(
+        f"{url}?cursor={last_page.previous_cursor}"
+    ).context["page_obj"]
+    assert [post.id for post in previous] == seen[:N_PER_PAGE]
+    assert not previous.has_previous()
+
+
+@override_settings(CURSOR_PAGINATION=True)
+def test_page_number_links_still_work(
+        user_client, many_posts_with_published_locations
+):
+    page_obj = user_client.get("/?page=2").context["page_obj"]
+    assert page_obj.number == 2, (
+        "Убедитесь, что ссылки вида `?page=N` продолжают работать."
+    )
+    assert len(page_obj) == N_PER_PAGE
+
+
+def test_broken_cursor_falls_back_to_first_page(
+        user_client, many_posts_with_published_locations
+):
+    response = user_client.get("/?cursor=not-a-cursor")
+    assert response.status_code == 200
+    assert len(response.context["page_obj"]) == N_PER_PAGE
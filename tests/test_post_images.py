@@ -0,0 +1,36 @@
+import pytest
+from bs4 import BeautifulSoup
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_upload_creates_derivatives(post_with_published_location):
+    variants = post_with_published_location.image_variants
+    assert variants["source"] == post_with_published_location.image.name
+    for size in ("card", "detail"):
+        assert {"name", "width", "height"} <= set(variants[size]), (
+            "Убедитесь, что при загрузке фото создаются уменьшенные копии"
+            " с сохранёнными размерами."
+        )
+
+
+def test_card_image_has_srcset(user_client, post_with_published_location):
+    soup = BeautifulSoup(user_client.get("/").content, "html.parser")
+    img = soup.find("img", srcset=True)
+    assert img is not None, (
+        "Убедитесь, что фото в карточке поста выводится с `srcset`."
+    )
+    assert img["loading"] == "lazy"
+    assert img["width"] and img["height"]
+
+
+def test_backfill_command(post_with_published_location):
+    post = post_with_published_location
+    type(post).objects.filter(pk=post.pk).update(image_variants={})
+    call_command("generate_post_images", workers=1)
+    post.refresh_from_db()
+    assert "card" in post.image_variants, (
+        "Убедитесь, что команда `generate_post_images` создаёт копии для"
+        " уже загруженных фото."
+    )
@@ -0,0 +1,112 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_page_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return len(ctx.captured_queries)
+
+
+def feed_urls(user, category):
+    return (
+        "/",
+        f"/category/{category.slug}/",
+        f"/profile/{user.username}/",
+    )
+
+
+def test_feed_queries_do_not_depend_on_page_size(
+        mixer: Mixer, user, user_client, published_category,
+        published_location
+):
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+    one_post_counts = [
+        count_page_queries(user_client, url)
+        for url in feed_urls(user, published_category)
+    ]
+    mixer.cycle(N_PER_PAGE * 2).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+    full_page_counts = [
+        count_page_queries(user_client, url)
+        for url in feed_urls(user, published_category)
+    ]
+    assert one_post_counts == full_page_counts, (
+        "Убедитесь, что число запросов к БД на страницах с лентой публикаций"
+        " не зависит от количества постов на странице."
+    )
+
+
+@pytest.mark.parametrize("url_name", ("index", "category", "profile"))
+def test_feed_query_budget(
+        url_name, user, user_client, published_category,
+        many_posts_with_published_locations
+):
+    urls = dict(zip(
+        ("index", "category", "profile"),
+        feed_urls(user, published_category),
+    ))
+    n_queries = count_page_queries(user_client, urls[url_name])
+    assert n_queries <= 5, (
+        f"Страница `{urls[url_name]}` выполняет {n_queries} запросов к БД."
+    )
+
+
+def test_post_detail_queries_and_comment_page(
+        mixer: Mixer, user_client, post_with_published_location
+):
+    from core.canstants import COMMENT_COUNT
+
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    mixer.blend("blog.Comment", post=post)
+    one_comment_count = count_page_queries(user_client, url)
+    mixer.cycle(COMMENT_COUNT + 5).blend("blog.Comment", post=post)
+    assert count_page_queries(user_client, url) == one_comment_count, (
+        "Убедитесь, что число запросов на странице поста не зависит от"
+        " количества комментариев."
+    )
+    comments = user_client.get(url).context["comments"]
+    assert len(comments) == COMMENT_COUNT, (
+        "Убедитесь, что комментарии к посту выводятся постранично."
+    )
+    next_page = user_client.get(
+        f"{url}?comment_cursor={comments.next_cursor}"
+    ).context["comments"]
+    assert len(next_page) == 6
+
+
+@pytest.mark.parametrize("action", ("edit", "delete"))
+def test_owner_views_fetch_post_once(
+        action, user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/{action}/"
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.get(url)
+    assert response.status_code == 200
+    post_selects = [
+        query["sql"] for query in ctx.captured_queries
+        if query["sql"].startswith("SELECT")
+        and 'FROM "blog_post"' in query["sql"]
+    ]
+    assert len(post_selects) == 1, (
+        f"Убедитесь, что страница `{url}` загружает пост из БД один раз."
+    )
@@ -0,0 +1,58 @@
+import pytest
+from django.test import Client, override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budgets():
+    with override_settings(QUERY_INSTRUMENTATION=True,
+                           QUERY_BUDGET_STRICT=True):
+        from core.middleware import reset_query_stats
+
+        reset_query_stats()
+        yield
+
+
+@pytest.fixture
+def budgeted_urls(user, post_with_published_location, mixer):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    return (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{user.username}/",
+        f"/posts/{post.id}/",
+        "/pages/about/",
+        "/pages/rules/",
+    )
+
+
+def test_views_fit_query_budgets(user_client, budgeted_urls):
+    for url in budgeted_urls:
+        response = user_client.get(url)
+        assert response.status_code == 200, url
+        assert response["Server-Timing"].startswith("db;dur="), (
+            f"Убедитесь, что ответ `{url}` содержит заголовок Server-Timing."
+        )
+
+
+def test_budget_overrun_fails(user_client):
+    from core.middleware import QueryBudgetExceeded
+
+    with override_settings(QUERY_BUDGETS={"pages:about": 0}):
+        with pytest.raises(QueryBudgetExceeded):
+            user_client.get("/pages/about/")
+
+
+def test_stats_panel_for_staff_only(mixer, user_client, budgeted_urls):
+    user_client.get(budgeted_urls[0])
+    assert user_client.get("/pages/queries/").status_code == 403
+
+    staff = Client()
+    staff.force_login(mixer.blend("auth.User", is_staff=True))
+    content = staff.get("/pages/queries/").content.decode("utf-8")
+    assert "blog:index" in content, (
+        "Убедитесь, что на странице статистики видна сводка по"
+        " представлениям."
+    )
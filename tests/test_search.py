@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(**kwargs):
+        kwargs.setdefault("title", "Заметка")
+        kwargs.setdefault("text", "Обычный текст.")
+        kwargs.setdefault("is_published", True)
+        return mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            pub_date=timezone.now() - timedelta(days=1), **kwargs,
+        )
+    return make
+
+
+def found(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_ranks_and_filters(client, make_post):
+    in_text = make_post(text="Прогулка по ЛЕСУ и полям.")
+    in_title = make_post(title="Лес осенью")
+    make_post(text="Про море.")
+    hidden = make_post(title="Лес", is_published=False)
+
+    assert found(client, "лес") == [in_title.id, in_text.id], (
+        "Убедитесь, что поиск находит посты по словам заголовка и текста"
+        " без учёта регистра, а совпадения в заголовке идут первыми."
+    )
+    assert hidden.id not in found(client, "лес"), (
+        "Убедитесь, что поиск не показывает скрытые публикации."
+    )
+    assert found(client, "") == []
+
+
+def test_index_follows_changes(client, make_post):
+    post = make_post(text="Старое слово")
+    post.text = "Новое слово"
+    post.save()
+    assert found(client, "старое") == []
+    assert found(client, "новое") == [post.id], (
+        "Убедитесь, что индекс поиска обновляется при изменении поста."
+    )
+    post.delete()
+    assert found(client, "новое") == []
+
+    post = make_post(title="Перестроение")
+    call_command("rebuild_search_index")
+    assert found(client, "перестроение") == [post.id]
+
+
+def test_admin_search_uses_index(mixer, make_post):
+    post = make_post(text="Редкое слово в тексте")
+    make_post()
+    admin = Client()
+    admin.force_login(mixer.blend("auth.User", is_staff=True,
+                                  is_superuser=True))
+    response = admin.get("/admin/blog/post/", {"q": "редкое"})
+    assert response.status_code == 200
+    results = list(response.context["cl"].result_list)
+    assert results == [post], (
+        "Убедитесь, что поиск в админке находит посты по тексту."
+    )
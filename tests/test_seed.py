@@ -0,0 +1,21 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_seed_blog_creates_consistent_data():
+    from blog.models import Comment, Post
+
+    call_command(
+        "seed_blog", users=5, categories=2, locations=2, posts=30,
+        comments=100, batch_size=7, stdout=StringIO(),
+    )
+    assert Post.objects.count() == 30
+    assert Comment.objects.count() == 100
+    assert not Post.objects.with_stale_comment_count().exists(), (
+        "Убедитесь, что после `seed_blog` счётчики комментариев совпадают"
+        " с числом комментариев."
+    )
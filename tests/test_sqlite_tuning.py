@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection, transaction
+
+@pytest.mark.django_db
+def test_sqlite_pragmas_applied(settings):
+    if connection.vendor != "sqlite":
+        pytest.skip("Настройки применяются только к SQLite.")
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA busy_timeout")
+        (busy_timeout,) = cursor.fetchone()
+    assert busy_timeout == settings.SQLITE_PRAGMAS["busy_timeout"], (
+        "Убедитесь, что к соединению SQLite применяются `SQLITE_PRAGMAS`."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_read_router_keeps_transactions_on_default():
+    from blog.models import Post
+    from core.routers import ReadReplicaRouter
+
+    router = ReadReplicaRouter()
+    assert router.db_for_read(Post) == "replica"
+    assert router.db_for_write(Post) == "default"
+    with transaction.atomic():
+        assert router.db_for_read(Post) == "default", (
+            "Убедитесь, что внутри транзакции чтение идёт в основное"
+            " соединение."
+        )
+    assert not router.allow_migrate("replica", "blog")
+
+
+def test_read_only_connection_skips_journal_mode(tmp_path, django_db_blocker):
+    import sqlite3
+
+    from django.db.utils import ConnectionHandler
+
+    path = tmp_path / "db.sqlite3"
+    with sqlite3.connect(path) as raw:
+        raw.execute("CREATE TABLE t (id integer)")
+    raw.close()
+    handler = ConnectionHandler({"default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": f"file:{path}?mode=ro",
+        "OPTIONS": {"uri": True},
+    }})
+    read_only = handler["default"]
+    try:
+        with django_db_blocker.unblock(), read_only.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM t")
+            assert cursor.fetchone() == (0,)
+            cursor.execute("PRAGMA journal_mode")
+            (journal_mode,) = cursor.fetchone()
+    finally:
+        read_only.close()
+    assert journal_mode == "delete", (
+        "Убедитесь, что соединение только для чтения не переключает файл"
+        " базы в WAL: без права записи это падает с ошибкой."
+    )
@@ -0,0 +1,81 @@
+import gzip
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+
+@pytest.fixture
+def collected_static(tmp_path):
+    with override_settings(
+        STATIC_ROOT=tmp_path,
+        STATICFILES_STORAGE=(
+            "core.storage.CompressedManifestStaticFilesStorage"
+        ),
+    ):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        yield tmp_path
+
+
+def hashed_css(static_root):
+    return next(
+        path for path in (static_root / "css").iterdir()
+        if path.name.startswith("bootstrap.min.")
+        and path.name.endswith(".css")
+        and path.name != "bootstrap.min.css"
+    )
+
+
+def test_collectstatic_writes_compressed_copies(collected_static):
+    css = hashed_css(collected_static)
+    compressed = css.with_name(css.name + ".gz")
+    assert compressed.exists(), (
+        "Убедитесь, что `collectstatic` создаёт gzip-копии файлов с хэшем"
+        " в имени."
+    )
+    assert gzip.decompress(compressed.read_bytes()) == css.read_bytes()
+
+
+def test_hashed_static_is_immutable_and_compressed(collected_static, client):
+    css = hashed_css(collected_static)
+    response = client.get(
+        f"/static/css/{css.name}", HTTP_ACCEPT_ENCODING="gzip, deflate"
+    )
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с хэшем в имени отдаются с заголовком"
+        " `Cache-Control: immutable`."
+    )
+    assert "Accept-Encoding" in response["Vary"]
+    assert gzip.decompress(b"".join(response.streaming_content)) == (
+        css.read_bytes()
+    )
+    not_modified = client.get(
+        f"/static/css/{css.name}",
+        HTTP_ACCEPT_ENCODING="gzip",
+        HTTP_IF_NONE_MATCH=response["ETag"],
+    )
+    assert not_modified.status_code == 304
+
+
+def test_media_range_request(tmp_path, client):
+    (tmp_path / "post_images").mkdir()
+    (tmp_path / "post_images" / "clip.bin").write_bytes(bytes(range(100)))
+    with override_settings(MEDIA_ROOT=tmp_path):
+        response = client.get(
+            "/media/post_images/clip.bin", HTTP_RANGE="bytes=10-19"
+        )
+        assert response.status_code == 206, (
+            "Убедитесь, что загруженные файлы отдаются по частям в ответ"
+            " на заголовок Range."
+        )
+        assert b"".join(response.streaming_content) == bytes(range(10, 20))
+        assert response["Content-Range"] == "bytes 10-19/100"
+        assert "immutable" not in response["Cache-Control"]
+
+        unsatisfiable = client.get(
+            "/media/post_images/clip.bin", HTTP_RANGE="bytes=200-"
+        )
+        assert unsatisfiable.status_code == 416
+        assert client.get("/media/../settings.py").status_code == 404
@@ -0,0 +1,60 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def run(*args, **options):
+    call_command(*args, stdout=StringIO(), **options)
+
+
+@pytest.mark.parametrize("file_format", ("json", "ndjson"))
+def test_export_import_roundtrip(
+        file_format, tmp_path, mixer, post_with_published_location
+):
+    from blog.models import Category, Comment, Location, Post, User
+
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, author=post.author)
+    path = tmp_path / f"blog.{file_format}"
+    run("export_blog", str(path), format=file_format, batch_size=2)
+    created_at = post.created_at
+
+    for model in (Post, User, Category, Location):
+        model.objects.all().delete()
+    run("import_blog", str(path), batch_size=2)
+
+    post = Post.objects.get(pk=post.pk)
+    assert post.created_at == created_at, (
+        "Убедитесь, что при загрузке сохраняются даты из файла."
+    )
+    assert Comment.objects.filter(post=post).count() == 3
+    assert post.comment_count == 3
+
+
+def test_import_resolves_forward_references(tmp_path, mixer, user):
+    from blog.models import Comment, Post
+
+    category = mixer.blend("blog.Category")
+    rows = [
+        {"model": "blog.comment", "pk": 10,
+         "fields": {"text": "Ранний", "author": user.pk, "post": 5,
+                    "created_at": "2024-01-01T00:00:00Z"}},
+        {"model": "blog.post", "pk": 5,
+         "fields": {"title": "Пост", "text": "Текст", "author": user.pk,
+                    "category": category.pk, "location": 999,
+                    "pub_date": "2024-01-01T00:00:00Z",
+                    "created_at": "2024-01-01T00:00:00Z"}},
+    ]
+    path = tmp_path / "blog.ndjson"
+    path.write_text("\n".join(json.dumps(row) for row in rows))
+    run("import_blog", str(path), batch_size=1)
+
+    assert Comment.objects.get(pk=10).post_id == 5, (
+        "Убедитесь, что объекты, ссылающиеся на записи ниже по файлу,"
+        " загружаются после них."
+    )
+    assert Post.objects.get(pk=5).location_id is None
@@ -0,0 +1,105 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_public_feed_reads_only_posts():
+    from blog.querysets import limited_access_posts
+
+    sql = str(limited_access_posts().query)
+    assert '"blog_category"' not in sql, (
+        "Убедитесь, что публичная лента не соединяет таблицу категорий,"
+        " а проверяет флаг `is_visible` поста."
+    )
+
+
+def test_category_toggle_updates_posts(
+        mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    unpublished = mixer.blend("blog.Post", category=post.category,
+                              is_published=False)
+    assert post.is_visible and not unpublished.is_visible
+
+    admin = Client()
+    admin.force_login(mixer.blend("auth.User", is_staff=True,
+                                  is_superuser=True))
+    category = post.category
+    with CaptureQueriesContext(connection) as queries:
+        admin.post("/admin/blog/category/", {
+            "form-TOTAL_FORMS": 1,
+            "form-INITIAL_FORMS": 1,
+            "form-0-id": category.id,
+            "_save": "Сохранить",
+        })
+    post.refresh_from_db()
+    assert not post.is_visible, (
+        "Убедитесь, что снятие категории с публикации скрывает её посты."
+    )
+    post_updates = [query for query in queries.captured_queries
+                    if query["sql"].startswith('UPDATE "blog_post"')]
+    assert len(post_updates) == 1, (
+        "Убедитесь, что флаги постов категории обновляются одним UPDATE."
+    )
+    assert post.id not in [p.id for p in client.get("/").context["page_obj"]]
+
+    category.is_published = True
+    category.save()
+    post.refresh_from_db()
+    unpublished.refresh_from_db()
+    assert post.is_visible and not unpublished.is_visible
+
+
+def test_location_toggle_updates_cards(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    location = post.location
+    assert post.public_location_id == location.id
+
+    location.is_published = False
+    location.save()
+    post.refresh_from_db()
+    assert post.public_location_id is None
+    content = user_client.get(f"/posts/{post.id}/").content.decode("utf-8")
+    assert location.name not in content, (
+        "Убедитесь, что снятое с публикации местоположение не показывается"
+        " в посте."
+    )
+
+
+def test_sync_visibility_repairs_flags(post_with_published_location):
+    from blog.models import Category, Post
+
+    post = post_with_published_location
+    Category.objects.filter(pk=post.category_id).update(is_published=False)
+    assert Post.objects.with_stale_visibility().count() == 1
+
+    call_command("sync_visibility")
+    post.refresh_from_db()
+    assert not post.is_visible, (
+        "Убедитесь, что команда `sync_visibility` чинит флаги видимости."
+    )
+    assert Post.objects.with_stale_visibility().count() == 0
+
+
+def test_post_save_reads_flags_from_database(post_with_published_location):
+    from blog.lookups import categories
+    from blog.models import Category, Location
+
+    post = post_with_published_location
+    categories.get(post.category_id)
+    Category.objects.filter(pk=post.category_id).update(is_published=False)
+    Location.objects.filter(pk=post.location_id).update(is_published=False)
+    assert categories.get(post.category_id).is_published
+
+    post.save()
+    post.refresh_from_db()
+    assert (post.is_visible, post.public_location_id) == (False, None), (
+        "Убедитесь, что флаги видимости поста берутся из БД, а не из"
+        " справочников процесса."
+    )